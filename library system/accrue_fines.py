@@ -0,0 +1,64 @@
+"""
+Fine Accrual Script
+Nightly batch that writes the fine accrued so far onto every open issue,
+so finance can query issues.fine without waiting for returns. Safe to
+interrupt: running it again for the same date resumes where it stopped.
+
+Schedule it once a day, e.g. from cron:
+    15 2 * * *  cd /path/to/library && python accrue_fines.py
+"""
+
+import argparse
+import time
+from datetime import date
+
+from library_management_system import ACCRUAL_BATCH_SIZE, DatabaseManager
+
+
+def accrue_fines(as_of=None, batch_size=ACCRUAL_BATCH_SIZE, max_batches=None, report_every=50000):
+    """Run (or resume) the accrual for one date and print its throughput"""
+
+    print("=" * 60)
+    print("Library Management System - Fine Accrual")
+    print("=" * 60)
+    print()
+
+    db = DatabaseManager(pool_size=1)
+    if not db.pool:
+        print("❌ Could not connect to the database")
+        return False
+
+    start = time.perf_counter()
+    done = 0
+
+    def progress(scanned):
+        nonlocal done
+        if scanned // report_every > done // report_every:
+            rate = scanned / (time.perf_counter() - start)
+            print(f"  {scanned:>12,} rows  {rate:>10,.0f} rows/s")
+        done = scanned
+
+    summary = db.accrue_fines(as_of=as_of, batch_size=batch_size, progress=progress, max_batches=max_batches)
+    db.pool.close()
+    elapsed = time.perf_counter() - start
+
+    if summary['resumed_from']:
+        print(f"Resumed after issue {summary['resumed_from']}")
+    print(f"{'Open issues scanned':<24} {summary['scanned']:>12,}")
+    print(f"{'Fines updated':<24} {summary['updated']:>12,}")
+    print(f"{'This run':<24} {done:>12,} rows in {elapsed:.1f}s ({done / elapsed:,.0f} rows/s)")
+    print()
+    if summary['finished']:
+        print("✓ Fines accrued for every open issue")
+    else:
+        print("Stopped early - run again to resume")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write accrued overdue fines onto open issues")
+    parser.add_argument('--date', type=date.fromisoformat, help="accrue as of this date (YYYY-MM-DD, default today)")
+    parser.add_argument('--batch-size', type=int, default=ACCRUAL_BATCH_SIZE, help="issues per transaction")
+    parser.add_argument('--max-batches', type=int, help="stop after this many batches (resume later)")
+    args = parser.parse_args()
+    accrue_fines(as_of=args.date, batch_size=args.batch_size, max_batches=args.max_batches)
@@ -0,0 +1,368 @@
+"""
+Library API Server
+JSON over HTTP for books, students, issues, returns, overdue loans,
+statistics and exports, on top of DatabaseManager, so every desk can
+share one server and its connection pool instead of each running a fat
+client with its own connections.
+
+Standard library only: asyncio serves the sockets, and the blocking
+DatabaseManager calls run on a thread pool the size of the connection
+pool. Exports are streamed as chunked JSON, a batch at a time, at most
+MAX_EXPORTS (and fewer than the pooled connections) at once.
+
+    GET  /books?q=&category=&author=&available=1&after_title=&after_id=&limit=
+    GET  /students?after_name=&after_id=&limit=
+    GET  /students/<id>            /students/<id>/issues   /students/<id>/history
+    POST /issues                   {"book_id": 1, "student_id": 2, "days": 14}
+    POST /issues/<id>/return       {"damage_charge": 0}
+    GET  /overdue?after_date=&after_id=&limit=
+    GET  /statistics               /fines
+    GET  /export/books             /export/students        /export/issues
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+from library_management_system import (API_HOST, API_PORT, API_TOKEN, DB_POOL_SIZE, EXPORT_QUERIES,
+                                       SEARCH_RESULT_LIMIT, DatabaseManager)
+
+# Largest page any listing returns, whatever limit is asked for
+MAX_PAGE = 500
+
+# Exports streamed at once; each keeps a pooled connection while the client
+# downloads, so this is also kept below the pool size
+MAX_EXPORTS = 2
+
+# Seconds an idle keep-alive connection is kept open
+KEEPALIVE_TIMEOUT = 15
+
+# Largest request body accepted, in bytes
+MAX_BODY = 64 * 1024
+
+STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+               405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """An error answered with its status code and a JSON message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def to_json(value):
+    return json.dumps(value, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+class Request:
+    """One parsed HTTP request"""
+
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path.rstrip('/') or '/'
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            value = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        if not isinstance(value, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return value
+
+    def number(self, name, value=None, default=None, cast=int):
+        """A numeric query parameter (or body field if value is given)"""
+        raw = self.query.get(name) if value is None else value
+        if raw is None or raw == '':
+            return default
+        try:
+            return cast(raw)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"{name} must be a number")
+
+    def limit(self, default=50):
+        return max(1, min(self.number('limit', default=default), MAX_PAGE))
+
+
+class APIServer:
+    """Routes HTTP requests to DatabaseManager methods"""
+
+    def __init__(self, db, workers=None, token=None):
+        self.db = db
+        self.token = token
+        # One thread per pooled connection. Calls return their connection
+        # before their thread, except exports, which hold one between
+        # batches while the client downloads; capping them below the pool
+        # size leaves a connection for every other endpoint
+        self.executor = ThreadPoolExecutor(max_workers=workers or db.pool_size, thread_name_prefix='api-db')
+        self.exports = asyncio.Semaphore(max(1, min(MAX_EXPORTS, db.pool_size - 1)))
+        self.routes = [
+            ('GET', r'/books', self.books),
+            ('GET', r'/students', self.students),
+            ('GET', r'/students/(\d+)', self.student),
+            ('GET', r'/students/(\d+)/issues', self.student_issues),
+            ('GET', r'/students/(\d+)/history', self.student_history),
+            ('POST', r'/issues', self.issue),
+            ('POST', r'/issues/(\d+)/return', self.return_issue),
+            ('GET', r'/overdue', self.overdue),
+            ('GET', r'/statistics', self.statistics),
+            ('GET', r'/fines', self.fines),
+            ('GET', r'/export/(\w+)', self.export),
+        ]
+        self.routes = [(method, re.compile(pattern + '$'), handler) for method, pattern, handler in self.routes]
+
+    async def call(self, func, *args):
+        """Run a blocking DatabaseManager call on the worker threads"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    # Endpoints: each returns (status, body) or streams its own response
+
+    async def books(self, request):
+        if request.query.get('q'):
+            limit = min(request.limit(SEARCH_RESULT_LIMIT), SEARCH_RESULT_LIMIT)
+            return 200, await self.call(self.db.search_books, request.query['q'], limit)
+        filters = {
+            'category': request.query.get('category'),
+            'author': request.query.get('author'),
+            'available_only': request.query.get('available') in ('1', 'true'),
+        }
+        return 200, await self.call(self.db.get_books_page, request.query.get('after_title'),
+                                    request.number('after_id'), request.limit(), filters)
+
+    async def students(self, request):
+        return 200, await self.call(self.db.get_students_page, request.query.get('after_name'),
+                                    request.number('after_id'), request.limit())
+
+    async def student(self, request, student_id):
+        student = await self.call(self.db.get_student, int(student_id))
+        if student is None:
+            raise HTTPError(404, "No such student")
+        return 200, student
+
+    async def student_issues(self, request, student_id):
+        return 200, await self.call(self.db.get_open_issues, int(student_id))
+
+    async def student_history(self, request, student_id):
+        return 200, await self.call(self.db.get_student_history, int(student_id))
+
+    async def issue(self, request):
+        body = request.json()
+        book_id = request.number('book_id', body.get('book_id'))
+        student_id = request.number('student_id', body.get('student_id'))
+        if book_id is None or student_id is None:
+            raise HTTPError(400, "book_id and student_id are required")
+        days = request.number('days', body.get('days'), default=14)
+        success, message = await self.call(self.db.issue_book, book_id, student_id, days)
+        return (201 if success else 409), {'message' if success else 'error': message}
+
+    async def return_issue(self, request, issue_id):
+        body = request.json()
+        damage_charge = request.number('damage_charge', body.get('damage_charge'), default=0, cast=float)
+        success, message = await self.call(self.db.return_book, int(issue_id), damage_charge)
+        return (200 if success else 409), {'message' if success else 'error': message}
+
+    async def overdue(self, request):
+        after_date = request.query.get('after_date')
+        if after_date:
+            try:
+                after_date = date.fromisoformat(after_date)
+            except ValueError:
+                raise HTTPError(400, "after_date must be YYYY-MM-DD")
+        return 200, await self.call(self.db.get_overdue_page, after_date or None,
+                                    request.number('after_id'), request.limit())
+
+    async def statistics(self, request):
+        return 200, await self.call(self.db.get_statistics)
+
+    async def fines(self, request):
+        return 200, await self.call(self.db.get_fine_summary)
+
+    async def export(self, request, table_name, writer):
+        """Stream a whole table as a JSON array of objects, a batch per chunk"""
+        if table_name not in EXPORT_QUERIES:
+            raise HTTPError(404, f"No export named {table_name}")
+        # Queue here, holding no thread or connection, while others stream
+        async with self.exports:
+            rows = self.db.stream_table(table_name)
+            try:
+                columns = await self.call(next, rows)
+                writer.write(self._head(200, request.keep_alive, chunked=True))
+                separator = b'['
+                try:
+                    while True:
+                        batch = await self.call(next, rows, None)
+                        if batch is None:
+                            break
+                        data = separator + b','.join(to_json(dict(zip(columns, row))) for row in batch)
+                        separator = b','
+                        writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+                        # Wait for the client to take the chunk before reading more
+                        await writer.drain()
+                except Exception as e:
+                    # The status line has gone out, so the only way left to
+                    # signal a failure is to cut the response short
+                    writer.transport.abort()
+                    raise ConnectionAbortedError(f"Export failed: {e}")
+                tail = b']' if separator == b',' else b'[]'
+                writer.write(b'%x\r\n%s\r\n0\r\n\r\n' % (len(tail), tail))
+                await writer.drain()
+            finally:
+                # Hands the connection back to the pool, even on a disconnect
+                await self.call(rows.close)
+
+    # HTTP plumbing
+
+    def _head(self, status, keep_alive, length=None, chunked=False):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", "Content-Type: application/json",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {length}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    def _respond(self, writer, status, body, keep_alive):
+        data = to_json(body)
+        writer.write(self._head(status, keep_alive, len(data)) + data)
+
+    async def _read_request(self, reader):
+        line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length') or 0)
+        if length > MAX_BODY:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return Request(method.upper(), target, version, headers, body)
+
+    def _authorized(self, request):
+        if self.token is None:
+            return True
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), self.token.encode())
+
+    async def dispatch(self, request, writer):
+        if not self._authorized(request):
+            raise HTTPError(401, "Missing or wrong API token")
+        allowed = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            allowed = True
+            if method != request.method:
+                continue
+            if handler == self.export:
+                await handler(request, *match.groups(), writer)
+                return
+            status, body = await handler(request, *match.groups())
+            self._respond(writer, status, body, request.keep_alive)
+            return
+        raise HTTPError(405, "Method not allowed") if allowed else HTTPError(404, "Not found")
+
+    async def handle(self, reader, writer):
+        """Serve one client connection, request after request while it stays open"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    break
+                except HTTPError as e:
+                    self._respond(writer, e.status, {'error': str(e)}, False)
+                    break
+                if request is None:
+                    break
+
+                try:
+                    await self.dispatch(request, writer)
+                except HTTPError as e:
+                    self._respond(writer, e.status, {'error': str(e)}, request.keep_alive)
+                except ConnectionError:
+                    break
+                except Exception as e:
+                    self._respond(writer, 500, {'error': f"{type(e).__name__}: {e}"}, False)
+                    break
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        # Load the overdue list and statistics now rather than on the first
+        # requests, which would otherwise queue behind them
+        await self.call(self.db.refresh_overdue)
+        await self.call(self.db.get_statistics)
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"✓ Serving the library API on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the library over a JSON HTTP API")
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    parser.add_argument('--db', help="database DSN, e.g. sqlite:///library.db (default DB_BACKEND settings)")
+    parser.add_argument('--pool-size', type=int, default=DB_POOL_SIZE, help="pooled database connections")
+    args = parser.parse_args()
+
+    db = DatabaseManager(pool_size=args.pool_size, backend=args.db)
+    if not db.pool:
+        print("❌ Could not connect to the database")
+        return
+    server = APIServer(db, token=API_TOKEN)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=False)
+        db.pool.close()
+
+
+if __name__ == "__main__":
+    main()
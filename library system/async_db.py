@@ -0,0 +1,293 @@
+"""
+Async Database Manager
+asyncio counterpart of DatabaseManager, for servers that handle many
+requests at once without a thread per request
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+try:
+    import aiomysql
+except ImportError:  # aiomysql is optional; without it calls run on threads
+    aiomysql = None
+
+from connection_pool import AsyncConnectionPool
+from db_backends import MySQLBackend
+from library_management_system import DB_POOL_SIZE, DatabaseManager
+
+
+def _native(method):
+    """Run the aiomysql version of a method, or else the DatabaseManager one on a thread"""
+    @functools.wraps(method)
+    async def run(self, *args, **kwargs):
+        if self.pool is None:
+            return await self.run(getattr(self.db, method.__name__), *args, **kwargs)
+        return await method(self, *args, **kwargs)
+    return run
+
+
+class AsyncDatabaseManager:
+    """DatabaseManager whose methods are coroutines
+
+    The wrapped DatabaseManager still creates the schema and owns what is
+    kept in memory (fine policies, the overdue tracker, the statistics
+    cache), so sync and async callers in one process see the same state.
+
+    With aiomysql installed and a MySQL backend, the listing, lookup,
+    issue and return methods below run on an AsyncConnectionPool of
+    aiomysql connections, and a coroutine waiting on the database holds no
+    thread. Otherwise (SQLite, or no aiomysql) each call runs the
+    DatabaseManager method on a thread pool of pool_size threads. Every
+    other DatabaseManager method is available the same way, as a coroutine.
+    Results and messages are the same either way.
+
+    Create one with ``await AsyncDatabaseManager.open(...)``, which takes
+    DatabaseManager's arguments, and ``await close()`` it when done.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.pool = None
+        self._executor = ThreadPoolExecutor(max_workers=db.pool_size, thread_name_prefix='async-db')
+
+    @classmethod
+    async def open(cls, pool_size=DB_POOL_SIZE, **kwargs):
+        """Connect (creating the schema if needed) without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        db = await loop.run_in_executor(None, functools.partial(DatabaseManager, pool_size=pool_size, **kwargs))
+        manager = cls(db)
+        if db.pool and aiomysql is not None and isinstance(db.backend, MySQLBackend):
+            config = db.backend.config
+            manager.pool = AsyncConnectionPool(functools.partial(
+                aiomysql.connect, host=config.get('host', 'localhost'), port=config.get('port', 3306),
+                user=config.get('user'), password=config.get('password', ''), db=config.get('database'),
+                autocommit=False), size=pool_size)
+        return manager
+
+    @property
+    def driver(self):
+        """'aiomysql' when queries run natively, 'threads' otherwise"""
+        return 'threads' if self.pool is None else 'aiomysql'
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking call on this manager's threads"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def __getattr__(self, name):
+        method = getattr(self.db, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+        call.__name__ = name
+        return call
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+        self._executor.shutdown(wait=False)
+        if self.db.pool:
+            self.db.pool.close()
+
+    async def _fetchall(self, sql, params=()):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, params)
+                return list(await cursor.fetchall())
+
+    async def _fetchone(self, sql, params=()):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, params)
+                return await cursor.fetchone()
+
+    # Reads (from the primary: replica routing stays with the sync manager)
+
+    @_native
+    async def get_all_books(self):
+        """Get all books"""
+        return await self._fetchall("SELECT * FROM books ORDER BY title")
+
+    @_native
+    async def get_all_students(self):
+        """Get all students"""
+        return await self._fetchall("SELECT * FROM students ORDER BY name")
+
+    @_native
+    async def get_books_page(self, after_title=None, after_id=None, limit=50, filters=None):
+        """Get one page of books ordered by title, starting after a keyset"""
+        return await self._fetchall(*self.db.books_page_query(after_title, after_id, limit, filters))
+
+    @_native
+    async def get_students_page(self, after_name=None, after_id=None, limit=50):
+        """Get one page of students ordered by name, starting after a keyset"""
+        return await self._fetchall(*self.db.students_page_query(after_name, after_id, limit))
+
+    @_native
+    async def get_student(self, student_id):
+        """Get one student by ID, or None"""
+        return await self._fetchone("""
+            SELECT student_id, name, email, phone
+            FROM students
+            WHERE student_id = %s
+        """, (student_id,))
+
+    @_native
+    async def get_open_issues(self, student_id):
+        """Get the books a student has out, soonest due first"""
+        return await self._fetchall("""
+            SELECT i.issue_id, b.title, b.author, b.category, i.issue_date, i.due_date
+            FROM issues i
+            JOIN books b ON i.book_id = b.book_id
+            WHERE i.student_id = %s AND i.status = 'issued'
+            ORDER BY i.due_date
+        """, (student_id,))
+
+    @_native
+    async def get_student_history(self, student_id):
+        """Get issue history for a student"""
+        return await self._fetchall("""
+            SELECT i.issue_id, b.title, b.author, i.issue_date,
+                   i.due_date, i.return_date, i.status, i.fine, i.damage_charge
+            FROM issues i
+            JOIN books b ON i.book_id = b.book_id
+            WHERE i.student_id = %s
+            ORDER BY i.issue_date DESC
+        """, (student_id,))
+
+    @_native
+    async def get_issued_books(self, limit=None):
+        """Get currently issued books, most recent first"""
+        query = """
+            SELECT i.issue_id, b.title, b.author, s.name as student_name,
+                   i.issue_date, i.due_date, i.status
+            FROM issues i
+            JOIN books b ON i.book_id = b.book_id
+            JOIN students s ON i.student_id = s.student_id
+            WHERE i.status = 'issued'
+            ORDER BY i.issue_date DESC
+        """
+        params = ()
+        if limit is not None:
+            query += " LIMIT %s"
+            params = (limit,)
+        return await self._fetchall(query, params)
+
+    # Served from the in-memory overdue tracker and statistics cache, which
+    # the sync manager owns and refreshes; threads whatever the driver
+
+    async def get_overdue_books(self):
+        """Get overdue books, most overdue first"""
+        return await self.run(self.db.get_overdue_books)
+
+    async def get_overdue_page(self, after_date=None, after_id=None, limit=50):
+        """One page of overdue books, most overdue first"""
+        return await self.run(self.db.get_overdue_page, after_date, after_id, limit)
+
+    async def get_statistics(self):
+        """Get library statistics, served from cache while it is fresh"""
+        return await self.run(self.db.get_statistics)
+
+    # Writes: the same statements, locking and counter updates as
+    # DatabaseManager.issue_book and return_book
+
+    @_native
+    async def issue_book(self, book_id, student_id, days=14):
+        """Issue a book to a student"""
+        async with self.pool.connection() as conn:
+            try:
+                async with conn.cursor() as cursor:
+                    if 'after_issue_insert' in self.db.issue_triggers:
+                        await cursor.execute("SELECT available FROM books WHERE book_id = %s FOR UPDATE", (book_id,))
+                        result = await cursor.fetchone()
+                        claimed = bool(result and result[0] > 0)
+                    else:
+                        claimed = await cursor.execute("""
+                            UPDATE books SET available = available - 1
+                            WHERE book_id = %s AND available > 0
+                        """, (book_id,)) == 1
+
+                    if not claimed:
+                        await conn.rollback()
+                        return False, "Book not available!"
+
+                    issue_date = datetime.now().date()
+                    due_date = issue_date + timedelta(days=days)
+                    await cursor.execute("""
+                        INSERT INTO issues (book_id, student_id, issue_date, due_date, status)
+                        VALUES (%s, %s, %s, %s, 'issued')
+                    """, (book_id, student_id, issue_date, due_date))
+                    issue_id = cursor.lastrowid
+
+                    await cursor.execute("""
+                        UPDATE library_counters
+                        SET available_books = available_books - 1,
+                            issued_books = issued_books + 1
+                        WHERE counter_id = 1
+                    """)
+
+                await conn.commit()
+                self.db.overdue.add(issue_id, due_date)
+                self.db.invalidate_statistics()
+                return True, "Book issued successfully!"
+            except aiomysql.Error as e:
+                return False, f"Error: {e}"
+
+    @_native
+    async def return_book(self, issue_id, damage_charge=0):
+        """Return a book"""
+        async with self.pool.connection() as conn:
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("""
+                        SELECT i.book_id, i.due_date, b.category
+                        FROM issues i
+                        JOIN books b ON i.book_id = b.book_id
+                        WHERE i.issue_id = %s AND i.status = 'issued'
+                    """, (issue_id,))
+                    result = await cursor.fetchone()
+                    if not result:
+                        return False, "Issue record not found!"
+
+                    book_id, due_date, category = result
+                    return_date = datetime.now().date()
+                    fine = self.db.calculate_fine(due_date, return_date, category)
+
+                    updated = await cursor.execute("""
+                        UPDATE issues
+                        SET return_date = %s, status = 'returned',
+                            fine = %s, damage_charge = %s
+                        WHERE issue_id = %s AND status = 'issued'
+                    """, (return_date, fine, damage_charge, issue_id))
+                    if updated != 1:
+                        await conn.rollback()
+                        return False, "Issue record not found!"
+
+                    if 'after_issue_update' not in self.db.issue_triggers:
+                        await cursor.execute("""
+                            UPDATE books SET available = available + 1
+                            WHERE book_id = %s
+                        """, (book_id,))
+
+                    await cursor.execute("""
+                        UPDATE library_counters
+                        SET available_books = available_books + 1,
+                            issued_books = issued_books - 1
+                        WHERE counter_id = 1
+                    """)
+
+                await conn.commit()
+                self.db.overdue.remove(issue_id)
+                self.db.invalidate_statistics()
+
+                total_charge = fine + damage_charge
+                msg = f"Book returned! Fine: ${fine:.2f}, Damage: ${damage_charge:.2f}, Total: ${total_charge:.2f}"
+                return True, msg
+            except aiomysql.Error as e:
+                return False, f"Error: {e}"
@@ -0,0 +1,95 @@
+"""
+Fine Accrual Benchmark
+Runs the nightly fine accrual over a large issues table on the SQLite
+stand-in database. The run is interrupted partway through, then resumed;
+the next day's run follows. The benchmark reports rows/s for each pass
+and checks that the stored fines match the fine engine's totals.
+
+Usage:
+    python benchmarks/bench_accrual.py --issues 5000000 --open 0.3 --batch-size 1000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+def seed(path, total, open_share, books=5000, students=2000):
+    """Issues over the last two years; the newest open_share are still out"""
+    conn = sqlite3.connect(path)
+    today = date.today()
+    open_from = int(total * (1 - open_share))
+    for start in range(0, total, 200000):
+        rows = []
+        for i in range(start, min(start + 200000, total)):
+            issued = today - timedelta(days=(total - i) * 730 // total)
+            status = 'issued' if i >= open_from else 'returned'
+            rows.append((i % books + 1, i % students + 1, issued, issued + timedelta(days=14), status))
+        conn.executemany(
+            "INSERT INTO issues (book_id, student_id, issue_date, due_date, status) VALUES (?, ?, ?, ?, ?)", rows
+        )
+    conn.commit()
+    conn.close()
+
+
+def stored_total(path):
+    conn = sqlite3.connect(path)
+    total = conn.execute("SELECT COALESCE(SUM(fine), 0) FROM issues WHERE status = 'issued'").fetchone()[0]
+    conn.close()
+    return round(total, 2)
+
+
+def timed_run(db, label, as_of, batch_size, max_batches=None):
+    start = time.perf_counter()
+    summary = db.accrue_fines(as_of=as_of, batch_size=batch_size, max_batches=max_batches)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {summary['scanned']:>10,} {summary['updated']:>10,} {elapsed:>8.1f} "
+          f"{'yes' if summary['finished'] else 'no':>9}")
+    return summary, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=5000000)
+    parser.add_argument('--open', type=float, default=0.3, help="share of issues still open")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'accrual.db')
+    create_database(path, books=5000, students=2000)
+    start = time.perf_counter()
+    seed(path, args.issues, args.open)
+    print(f"seeded {args.issues:,} issues in {time.perf_counter() - start:.0f}s")
+
+    db = DatabaseManager(pool_size=1, backend=StandInBackend(path))
+    today = date.today()
+    open_issues = int(args.issues * args.open)
+    interrupt_after = max(open_issues // args.batch_size // 3, 1)
+
+    print(f"{'pass':<22} {'scanned':>10} {'updated':>10} {'seconds':>8} {'finished':>9}")
+    first, first_time = timed_run(db, "night 1 (interrupted)", today, args.batch_size, interrupt_after)
+    resumed, resumed_time = timed_run(db, "night 1 (resumed)", today, args.batch_size)
+    again, _ = timed_run(db, "night 1 (re-run)", today, args.batch_size)
+    nightly = (resumed['scanned']) / (first_time + resumed_time)
+    print(f"night 1 throughput: {nightly:,.0f} rows/s over {resumed['scanned']:,} open issues")
+
+    expected = db.get_fine_summary()['outstanding_fines']
+    assert stored_total(path) == round(expected, 2), (stored_total(path), expected)
+    print(f"stored fines match the engine: ${expected:,.2f}")
+
+    tomorrow = today + timedelta(days=1)
+    second, second_time = timed_run(db, "night 2", tomorrow, args.batch_size)
+    print(f"night 2 throughput: {second['scanned'] / second_time:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
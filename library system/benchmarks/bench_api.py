@@ -0,0 +1,197 @@
+"""
+API Server Load Test
+Starts api_server.py on a seeded SQLite database and drives it at a fixed
+request rate (open loop: requests go out on schedule whether or not
+earlier ones have finished) over keep-alive connections, with a mix of
+listings, lookups, overdue pages, statistics and checkouts. Latency is
+measured from each request's scheduled send time, so a stalled server
+shows up in the percentiles instead of silently slowing the load.
+Finishes by streaming the issues export and checking it parses.
+
+Usage:
+    python benchmarks/bench_api.py --rate 500 --seconds 20 --connections 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from standin_db import create_database
+
+
+def seed_issues(path, issues, students, books):
+    conn = sqlite3.connect(path)
+    today = date.today()
+    rng = random.Random(2)
+    rows = []
+    for _ in range(issues):
+        issued = today - timedelta(days=rng.randint(0, 60))
+        rows.append((rng.randint(1, books), rng.randint(1, students), issued, issued + timedelta(days=14)))
+    conn.executemany(
+        "INSERT INTO issues (book_id, student_id, issue_date, due_date, status) VALUES (?, ?, ?, ?, 'issued')", rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def read_response(reader):
+    """(status, body bytes) of one response, plain or chunked"""
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding') == 'chunked':
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            body += chunk[:-2]
+        return status, bytes(body)
+    return status, await reader.readexactly(int(headers['content-length']))
+
+
+class Client:
+    """A pool of keep-alive connections to the server"""
+
+    def __init__(self, port, connections):
+        self.port = port
+        self.idle = asyncio.Queue()
+        for _ in range(connections):
+            self.idle.put_nowait(None)
+
+    async def request(self, method, path, body=None):
+        conn = await self.idle.get()
+        try:
+            if conn is None:
+                conn = await asyncio.open_connection('127.0.0.1', self.port)
+            reader, writer = conn
+            data = json.dumps(body).encode() if body is not None else b''
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n"
+                         .encode() + data)
+            response = await read_response(reader)
+        except Exception:
+            conn = None
+            raise
+        finally:
+            self.idle.put_nowait(conn)
+        return response
+
+
+def request_mix(rng, students, books):
+    """(kind, method, path, body) drawn from a desk-like mix"""
+    roll = rng.random()
+    if roll < 0.30:
+        return 'books page', 'GET', f"/books?limit=50&after_title=Book+{rng.randint(1, books):06d}&after_id=0", None
+    if roll < 0.45:
+        return 'book search', 'GET', f"/books?q=book+{rng.randint(1, books // 10)}&limit=20", None
+    if roll < 0.60:
+        return 'student', 'GET', f"/students/{rng.randint(1, students)}", None
+    if roll < 0.72:
+        return 'student issues', 'GET', f"/students/{rng.randint(1, students)}/issues", None
+    if roll < 0.84:
+        return 'overdue page', 'GET', "/overdue?limit=50", None
+    if roll < 0.95:
+        return 'statistics', 'GET', "/statistics", None
+    return 'issue book', 'POST', "/issues", {'book_id': rng.randint(1, books),
+                                             'student_id': rng.randint(1, students), 'days': 14}
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)] * 1000
+
+
+async def load(port, rate, seconds, connections, students, books):
+    client = Client(port, connections)
+    rng = random.Random(9)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    total = int(rate * seconds)
+    start = time.perf_counter() + 0.1
+
+    async def one(scheduled, kind, method, path, body):
+        await asyncio.sleep(max(0, scheduled - time.perf_counter()))
+        try:
+            status, _ = await client.request(method, path, body)
+            if status >= 500 or (status >= 400 and status != 409):
+                errors[kind] += 1
+        except Exception:
+            errors[kind] += 1
+        latencies[kind].append(time.perf_counter() - scheduled)
+
+    tasks = [asyncio.ensure_future(one(start + n / rate, *request_mix(rng, students, books))) for n in range(total)]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    everything = [value for values in latencies.values() for value in values]
+    print(f"{total} requests at {rate}/s target: {total / elapsed:,.0f}/s achieved over {elapsed:.1f}s, "
+          f"{sum(errors.values())} errors")
+    print(f"{'request':<16} {'count':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for kind in sorted(latencies) + ['all']:
+        values = everything if kind == 'all' else latencies[kind]
+        print(f"{kind:<16} {len(values):>7} {percentile(values, 0.5):>8.1f} {percentile(values, 0.99):>8.1f} "
+              f"{max(values) * 1000:>8.1f}")
+
+    start = time.perf_counter()
+    status, body = await client.request('GET', '/export/issues')
+    rows = json.loads(body)
+    print(f"\nexport/issues: HTTP {status}, {len(rows):,} rows, {len(body) / 2 ** 20:.1f} MB "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=int, default=500, help="requests per second")
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--connections', type=int, default=64, help="keep-alive client connections")
+    parser.add_argument('--pool-size', type=int, default=5, help="server database connections")
+    parser.add_argument('--books', type=int, default=5000)
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--issues', type=int, default=100000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'api.db')
+    create_database(path, books=args.books, students=args.students)
+    seed_issues(path, args.issues, args.students, args.books)
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'api_server.py'), '--port', str(port),
+                               '--db', f"sqlite:///{path}", '--pool-size', str(args.pool_size)],
+                              cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        for line in server.stdout:
+            if 'Serving' in line:
+                break
+        asyncio.run(load(port, args.rate, args.seconds, args.connections, args.students, args.books))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
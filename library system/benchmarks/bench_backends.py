@@ -0,0 +1,115 @@
+"""
+Storage Backend Benchmark
+Runs the same desk workload through DatabaseManager on each storage
+backend: an SQLite file in a temporary directory, and the MySQL server in
+DB_CONFIG when one is reachable. The MySQL run uses a scratch database,
+so the library database is left untouched.
+
+Usage:
+    python benchmarks/bench_backends.py --books 2000 --students 200 --loans 500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector import Error
+
+from db_backends import MySQLBackend, SQLiteBackend
+from library_management_system import DB_CONFIG, DatabaseManager
+
+
+def timed(timings, name, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings.setdefault(name, []).append(time.perf_counter() - start)
+    return result
+
+
+def workload(db, args):
+    """Drive one backend and return {operation: [seconds, ...]}"""
+    timings = {}
+    for i in range(args.books):
+        ok, msg = timed(timings, 'add_book', db.add_book, f"Backend Title {i:06d}", f"Author {i % 97}",
+                        f"BK-{i:09d}", f"Category {i % 12}", 3)
+        assert ok, msg
+    for i in range(args.students):
+        ok, msg = timed(timings, 'add_student', db.add_student, f"Student {i:06d}",
+                        f"backend{i}@example.com", f"{i:010d}", f"{i} Main Street")
+        assert ok, msg
+
+    books = [row['book_id'] for row in db.get_books_page(limit=args.books)]
+    students = [row['student_id'] for row in db.get_students_page(limit=args.students)]
+    for i in range(args.loans):
+        timed(timings, 'issue_book', db.issue_book, books[i % len(books)], students[i % len(students)])
+    for issue in db.get_issues_page(limit=args.loans // 2, filters={'status': 'issued'}):
+        timed(timings, 'return_book', db.return_book, issue['issue_id'])
+
+    for i in range(args.queries):
+        timed(timings, 'search_books', db.search_books, f"Title {i * 37 % args.books:06d}")
+        db.invalidate_statistics()
+        timed(timings, 'get_statistics', db.get_statistics)
+        timed(timings, 'get_books_page', db.get_books_page, after_title=f"Backend Title {i * 53 % args.books:06d}",
+              after_id=0, limit=50)
+        timed(timings, 'get_issues_page', db.get_issues_page, limit=50, filters={'status': 'issued'})
+
+    drift = db.reconcile_counters(fix=False)
+    assert not drift, f"counters drifted: {drift}"
+    return timings
+
+
+def mysql_backend():
+    """Backend on a scratch database next to DB_CONFIG's, or None"""
+    config = dict(DB_CONFIG, database=DB_CONFIG['database'] + '_bench')
+    backend = MySQLBackend(config)
+    try:
+        server = MySQLBackend({k: v for k, v in config.items() if k != 'database'}).connect()
+        cursor = server.cursor()
+        cursor.execute(f"DROP DATABASE IF EXISTS {config['database']}")
+        cursor.execute(f"CREATE DATABASE {config['database']}")
+        cursor.close()
+        server.close()
+    except Error as e:
+        print(f"MySQL skipped: {e}")
+        return None
+    return backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=2000)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--loans', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=200, help="rounds of search, statistics and paging")
+    args = parser.parse_args()
+
+    backends = [SQLiteBackend(os.path.join(tempfile.mkdtemp(), 'library.db'))]
+    backend = mysql_backend()
+    if backend:
+        backends.append(backend)
+
+    results = {}
+    for backend in backends:
+        db = DatabaseManager(pool_size=2, backend=backend)
+        start = time.perf_counter()
+        results[backend.name] = workload(db, args)
+        print(f"{backend.describe()}: workload in {time.perf_counter() - start:.1f}s")
+
+    names = list(results)
+    print(f"\n{'operation':<16}" + "".join(f" {name + ' p50 ms':>14} {'p95 ms':>8}" for name in names))
+    for operation in results[names[0]]:
+        line = f"{operation:<16}"
+        for name in names:
+            values = sorted(results[name][operation])
+            p95 = values[int(len(values) * 0.95) - 1] if len(values) > 1 else values[0]
+            line += f" {statistics.median(values) * 1000:>14.2f} {p95 * 1000:>8.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Batch Checkout Benchmark
+Times a cart of books issued and returned one call per book against
+issue_books/return_books, on the SQLite stand-in database with simulated
+network latency
+
+Usage:
+    python benchmarks/bench_batch_checkout.py --cart 10 --rounds 20 --latency 0.002
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+def open_issue_ids(db, student_id):
+    issues = db.get_issues_page(limit=1000, filters={'student_id': student_id, 'status': 'issued'})
+    return [issue['issue_id'] for issue in issues]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cart', type=int, default=10, help="books per student")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.002, help="simulated round trip in seconds")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'batch.db')
+    create_database(path, books=args.cart * 4, students=2, copies=5)
+    db = DatabaseManager(pool_size=2, backend=StandInBackend(path, args.latency))
+    books = list(range(1, args.cart + 1))
+
+    timings = {'issue_book': [], 'issue_books': [], 'return_book': [], 'return_books': []}
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        for book_id in books:
+            db.issue_book(book_id, 1)
+        timings['issue_book'].append(time.perf_counter() - start)
+
+        ids = open_issue_ids(db, 1)
+        start = time.perf_counter()
+        for issue_id in ids:
+            db.return_book(issue_id)
+        timings['return_book'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ok, msg = db.issue_books(2, books)
+        timings['issue_books'].append(time.perf_counter() - start)
+        assert ok, msg
+
+        ids = open_issue_ids(db, 2)
+        start = time.perf_counter()
+        ok, msg = db.return_books(ids)
+        timings['return_books'].append(time.perf_counter() - start)
+        assert ok, msg
+
+    print(f"cart of {args.cart} books, {args.latency * 1000:.1f} ms round trip, {args.rounds} rounds")
+    print(f"{'operation':<14} {'per cart ms':>12} {'per item ms':>12}")
+    for name, values in timings.items():
+        per_cart = statistics.median(values) * 1000
+        print(f"{name:<14} {per_cart:>12.1f} {per_cart / args.cart:>12.2f}")
+    print(f"issue speed-up:  {statistics.median(timings['issue_book']) / statistics.median(timings['issue_books']):.1f}x")
+    print(f"return speed-up: {statistics.median(timings['return_book']) / statistics.median(timings['return_books']):.1f}x")
+    print(f"counter drift: {db.reconcile_counters(fix=False) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+CSV Export Benchmark
+Exports the joined issues table at growing sizes from the SQLite stand-in
+database and reports the peak RSS of each export, measured in a fresh
+process so sizes do not share a high-water mark
+
+Usage:
+    python benchmarks/bench_export.py --rows 10000,100000,1000000,10000000
+"""
+
+import argparse
+import csv
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+def grow_issues(path, total, books=1000, students=1000):
+    """Insert issue rows until the table holds total rows"""
+    conn = sqlite3.connect(path)
+    have = conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+    start = date(2024, 1, 1)
+    while have < total:
+        count = min(100000, total - have)
+        conn.executemany(
+            "INSERT INTO issues (book_id, student_id, issue_date, due_date, return_date, status, fine, damage_charge) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(i % books + 1, i % students + 1, start + timedelta(days=i % 365),
+              start + timedelta(days=i % 365 + 14), None, 'issued', 0, 0)
+             for i in range(have, have + count)]
+        )
+        have += count
+    conn.commit()
+    conn.close()
+
+
+def export_fetchall(db, filename):
+    """The old export: fetchall() on the whole result, then write"""
+    with db.pool.connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT i.issue_id, b.title, s.name as student_name,
+                   i.issue_date, i.due_date, i.return_date,
+                   i.status, i.fine, i.damage_charge
+            FROM issues i
+            JOIN books b ON i.book_id = b.book_id
+            JOIN students s ON i.student_id = s.student_id
+        """)
+        data = cursor.fetchall()
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
+            writer.writeheader()
+            writer.writerows(data)
+        cursor.close()
+
+
+def run_child(path, mode, batch_size):
+    """Export once in this process and print 'rows seconds peak_rss_kb'"""
+    db = DatabaseManager(pool_size=1, backend=StandInBackend(path))
+    filename = os.path.join(os.path.dirname(path), 'issues.csv')
+    rows = 0
+
+    def progress(count):
+        nonlocal rows
+        rows = count
+
+    start = time.perf_counter()
+    if mode == 'stream':
+        success, message = db.export_to_csv('issues', filename, batch_size=batch_size, progress=progress)
+        if not success:
+            raise SystemExit(message)
+    else:
+        export_fetchall(db, filename)
+    elapsed = time.perf_counter() - start
+    os.remove(filename)
+    print(rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def measure(path, mode, batch_size):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', path, mode, '--batch-size', str(batch_size)],
+        check=True, capture_output=True, text=True
+    ).stdout.split()[-3:]
+    rows, elapsed, rss_kb = output
+    return int(rows), float(elapsed), int(rss_kb) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default="10000,100000,1000000,10000000", help="comma separated row counts")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--fetchall-limit', type=int, default=1000000,
+                        help="skip the old fetchall export above this many rows")
+    parser.add_argument('--child', nargs=2, metavar=('PATH', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.batch_size)
+        return
+
+    path = os.path.join(tempfile.mkdtemp(), 'export.db')
+    create_database(path, books=1000, students=1000)
+
+    print(f"{'rows':>10} {'stream MB':>10} {'rows/s':>10} {'fetchall MB':>12} {'rows/s':>10}")
+    for total in [int(n) for n in args.rows.split(',')]:
+        grow_issues(path, total)
+        rows, elapsed, stream_rss = measure(path, 'stream', args.batch_size)
+        line = f"{total:>10} {stream_rss:>10.1f} {rows / elapsed:>10.0f}"
+        if total <= args.fetchall_limit:
+            _, elapsed, fetchall_rss = measure(path, 'fetchall', args.batch_size)
+            line += f" {fetchall_rss:>12.1f} {total / elapsed:>10.0f}"
+        else:
+            line += f" {'skipped':>12}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
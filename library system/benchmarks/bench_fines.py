@@ -0,0 +1,95 @@
+"""
+Fine Engine Benchmark
+Computes accrued fines for every open loan under per-category policies:
+one calculate_fine call per loan, the engine's vectorized pass (numpy)
+and its pure-Python fallback, checking that all three agree. Then times
+get_fine_summary end to end, query included, on the SQLite stand-in.
+
+Usage:
+    python benchmarks/bench_fines.py --loans 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fine_engine
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+POLICIES = {
+    'default': {'rate': 5, 'grace_days': 0, 'cap': None},
+    'Category 0': {'rate': 1, 'grace_days': 3, 'cap': 20},
+    'Category 1': {'rate': 0.25, 'grace_days': 0, 'cap': 10},
+    'Category 2': {'rate': 2, 'grace_days': 7, 'cap': None},
+}
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loans', type=int, default=1000000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    today = date.today()
+    due_dates = [today - timedelta(days=rng.randint(-14, 120)) for _ in range(args.loans)]
+    categories = [f"Category {rng.randint(0, 11)}" for _ in range(args.loans)]
+    engine = fine_engine.FineEngine(POLICIES)
+    numpy = fine_engine.np
+
+    print(f"{args.loans} open loans, {len(POLICIES) - 1} category policies plus default")
+    print(f"{'method':<28} {'seconds':>8} {'loans/s':>12}")
+
+    def report(name, seconds):
+        print(f"{name:<28} {seconds:>8.3f} {args.loans / seconds:>12,.0f}")
+
+    per_loan, seconds = timed(lambda: [engine.fine(due, today, category)
+                                       for due, category in zip(due_dates, categories)])
+    report("calculate_fine per loan", seconds)
+
+    if numpy is not None:
+        vectorized, seconds = timed(lambda: engine.accrue(due_dates, categories, today))
+        report("vectorized (numpy)", seconds)
+        assert vectorized == per_loan
+        summary, seconds = timed(lambda: engine.summarize(due_dates, categories, today))
+        report("vectorized total only", seconds)
+    else:
+        print("numpy not installed; vectorized path skipped")
+
+    fine_engine.np = None
+    fallback, seconds = timed(lambda: engine.accrue(due_dates, categories, today))
+    report("pure-Python fallback", seconds)
+    assert fallback == per_loan
+    fine_engine.np = numpy
+    engine = fine_engine.FineEngine(POLICIES)
+
+    path = os.path.join(tempfile.mkdtemp(), 'fines.db')
+    create_database(path, books=5000, students=2000)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO issues (book_id, student_id, issue_date, due_date, status) VALUES (?, ?, ?, ?, 'issued')",
+        [(n % 5000 + 1, n % 2000 + 1, due - timedelta(days=14), due) for n, due in enumerate(due_dates)]
+    )
+    conn.commit()
+    conn.close()
+    db = DatabaseManager(pool_size=1, backend=StandInBackend(path), fine_policies=POLICIES)
+    summary, seconds = timed(db.get_fine_summary)
+    print(f"\nget_fine_summary: ${summary['outstanding_fines']:,.2f} across {summary['fined_loans']:,} loans "
+          f"in {seconds:.2f}s (query included)")
+
+
+if __name__ == "__main__":
+    main()
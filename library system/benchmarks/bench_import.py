@@ -0,0 +1,73 @@
+"""
+CSV Import Benchmark
+Imports a synthetic catalogue into the SQLite stand-in database at several
+transaction sizes, against one add_book call per row, and checks that the
+counters still match the tables afterwards
+
+Usage:
+    python benchmarks/bench_import.py --books 200000 --batch-sizes 100,1000,5000
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+def write_catalogue(filename, count):
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['title', 'author', 'isbn', 'category', 'quantity'])
+        for i in range(1, count + 1):
+            writer.writerow([f"Imported Title {i:07d}", f"Author {i % 4999}",
+                             f"978-{i:010d}", f"Category {i % 12}", 1 + i % 4])
+
+
+def fresh_manager(directory, name):
+    path = os.path.join(directory, name)
+    create_database(path, books=0, students=1)
+    return DatabaseManager(pool_size=1, backend=StandInBackend(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=200000)
+    parser.add_argument('--batch-sizes', default="100,1000,5000", help="comma separated transaction sizes")
+    parser.add_argument('--single-rows', type=int, default=5000,
+                        help="rows to time through add_book for comparison")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'books.csv')
+    write_catalogue(filename, args.books)
+
+    db = fresh_manager(directory, 'single.db')
+    start = time.perf_counter()
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        for n, row in enumerate(csv.DictReader(csvfile)):
+            if n == args.single_rows:
+                break
+            db.add_book(row['title'], row['author'], row['isbn'], row['category'], int(row['quantity']))
+    elapsed = time.perf_counter() - start
+    print(f"add_book, one row per transaction: {args.single_rows / elapsed:,.0f} rows/s")
+
+    for batch_size in [int(n) for n in args.batch_sizes.split(',')]:
+        db = fresh_manager(directory, f"batch{batch_size}.db")
+        print(f"\nbatch size {batch_size}")
+        success, message = db.import_books_csv(filename, batch_size=batch_size)
+        print(f"  first import:  {message}")
+        success, message = db.import_books_csv(filename, batch_size=batch_size)
+        print(f"  re-import:     {message}")
+        drift = db.reconcile_counters(fix=False)
+        print(f"  counters {'match' if not drift else f'drifted: {drift}'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Issue/Return Stress Benchmark
+Many desks issue and return a handful of scarce books at once through
+DatabaseManager on the SQLite stand-in database, counting every issue that
+oversold a book and checking that available copies still add up
+
+--legacy swaps in the old check-then-update issue_book to show the race;
+--triggers installs the availability triggers from library_db.sql.
+
+Usage:
+    python benchmarks/bench_issue_stress.py --threads 16 --attempts 200 --books 10 --copies 2
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER after_issue_insert AFTER INSERT ON issues
+    FOR EACH ROW WHEN NEW.status = 'issued'
+    BEGIN
+        UPDATE books SET available = available - 1
+        WHERE book_id = NEW.book_id AND available > 0;
+    END
+    """,
+    """
+    CREATE TRIGGER after_issue_update AFTER UPDATE ON issues
+    FOR EACH ROW WHEN OLD.status = 'issued' AND NEW.status = 'returned'
+    BEGIN
+        UPDATE books SET available = available + 1 WHERE book_id = NEW.book_id;
+    END
+    """,
+]
+
+
+# Records every issue that leaves a book with more open issues than copies;
+# SQLite runs it inside the writing transaction, so none slip past
+AUDIT = [
+    "CREATE TABLE oversells (issue_id INT)",
+    """
+    CREATE TRIGGER audit_oversell AFTER INSERT ON issues
+    FOR EACH ROW WHEN (
+        SELECT COUNT(*) FROM issues WHERE book_id = NEW.book_id AND status = 'issued'
+    ) > (SELECT quantity FROM books WHERE book_id = NEW.book_id)
+    BEGIN
+        INSERT INTO oversells VALUES (NEW.issue_id);
+    END
+    """,
+]
+
+
+def legacy_issue_book(self, book_id, student_id, days=14):
+    """issue_book as it was: read available, then insert and update separately"""
+    with self.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT available FROM books WHERE book_id = %s", (book_id,))
+        result = cursor.fetchone()
+        if not (result and result[0] > 0):
+            cursor.close()
+            return False, "Book not available!"
+        issue_date = datetime.now().date()
+        cursor.execute("""
+            INSERT INTO issues (book_id, student_id, issue_date, due_date, status)
+            VALUES (%s, %s, %s, %s, 'issued')
+        """, (book_id, student_id, issue_date, issue_date + timedelta(days=days)))
+        cursor.execute("UPDATE books SET available = available - 1 WHERE book_id = %s", (book_id,))
+        cursor.execute("""
+            UPDATE library_counters
+            SET available_books = available_books - 1, issued_books = issued_books + 1
+            WHERE counter_id = 1
+        """)
+        conn.commit()
+        cursor.close()
+        return True, "Book issued successfully!"
+
+
+def check(path):
+    """Return (oversells during the run, books whose counts do not add up now)"""
+    conn = sqlite3.connect(path)
+    oversells = conn.execute("SELECT COUNT(*) FROM oversells").fetchone()[0]
+    rows = conn.execute("""
+        SELECT b.book_id, b.quantity, b.available,
+               (SELECT COUNT(*) FROM issues i WHERE i.book_id = b.book_id AND i.status = 'issued')
+        FROM books b
+    """).fetchall()
+    conn.close()
+    mismatched = [r for r in rows if r[2] + r[3] != r[1]]
+    return oversells, mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--attempts', type=int, default=200, help="issue attempts per desk")
+    parser.add_argument('--books', type=int, default=10)
+    parser.add_argument('--copies', type=int, default=2)
+    parser.add_argument('--latency', type=float, default=0.001, help="simulated round trip in seconds")
+    parser.add_argument('--legacy', action='store_true', help="use the old check-then-update issue_book")
+    parser.add_argument('--triggers', action='store_true', help="install the library_db.sql triggers")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'stress.db')
+    create_database(path, books=args.books, students=args.threads, copies=args.copies)
+    conn = sqlite3.connect(path)
+    for statement in AUDIT + (TRIGGERS if args.triggers else []):
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(pool_size=args.threads, backend=StandInBackend(path, args.latency))
+    if args.legacy:
+        DatabaseManager.issue_book = legacy_issue_book
+    print(f"triggers detected: {sorted(db.issue_triggers) or 'none'}")
+
+    stats = {'issued': 0, 'refused': 0, 'returned': 0, 'double_returns_refused': 0, 'errors': 0}
+    lock = threading.Lock()
+    returned_ids = []
+
+    def count(key):
+        with lock:
+            stats[key] += 1
+
+    def desk(student_id):
+        rng = random.Random(student_id)
+        for _ in range(args.attempts):
+            ok, msg = db.issue_book(rng.randint(1, args.books), student_id)
+            count('issued' if ok else 'refused' if msg == "Book not available!" else 'errors')
+            if rng.random() < 0.5:
+                open_issues = db.get_issues_page(limit=1, filters={'student_id': student_id, 'status': 'issued'})
+                if open_issues:
+                    issue_id = open_issues[0]['issue_id']
+                    ok, msg = db.return_book(issue_id)
+                    count('returned' if ok else 'errors')
+                    with lock:
+                        returned_ids.append(issue_id)
+            elif returned_ids:
+                # Return something another desk already returned
+                ok, _ = db.return_book(rng.choice(returned_ids))
+                count('errors' if ok else 'double_returns_refused')
+
+    threads = [threading.Thread(target=desk, args=(n + 1,)) for n in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    oversells, mismatched = check(path)
+    drift = db.reconcile_counters(fix=False)
+    print(f"{args.threads} desks x {args.attempts} attempts over {args.books} books x {args.copies} copies "
+          f"in {elapsed:.1f}s")
+    for key, value in stats.items():
+        print(f"  {key:<24} {value}")
+    print(f"  {'issues/s':<24} {stats['issued'] / elapsed:.0f}")
+    print(f"  {'oversells':<24} {oversells}")
+    print(f"  {'count mismatches':<24} {len(mismatched)}")
+    print(f"  {'counter drift':<24} {drift or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
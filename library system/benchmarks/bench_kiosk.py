@@ -0,0 +1,98 @@
+"""
+Kiosk Lookup Benchmark
+Scans signed student QR payloads through StudentLookup on the SQLite
+stand-in database and reports scans/s with a cold student cache (every
+scan a student not seen before) and a warm one (every student cached),
+plus payload decoding on its own. --latency adds a simulated database
+round trip, which is what the cache saves on a real network.
+
+Usage:
+    python benchmarks/bench_kiosk.py --students 20000 --scans 5000 --latency 0.0005
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qr_payload import decode_payload, encode_payload
+from standin_db import StandInBackend, create_database
+from student_lookup import StudentLookup
+from library_management_system import DatabaseManager
+
+KEY = 'benchmark-signing-key'
+
+
+def seed_issues(path, students, per_student=3, books=5000):
+    """A few open issues per student, some of them overdue"""
+    conn = sqlite3.connect(path)
+    today = date.today()
+    rng = random.Random(11)
+    rows = []
+    for student_id in range(1, students + 1):
+        for _ in range(per_student):
+            issued = today - timedelta(days=rng.randint(0, 40))
+            rows.append((rng.randint(1, books), student_id, issued, issued + timedelta(days=14)))
+    conn.executemany(
+        "INSERT INTO issues (book_id, student_id, issue_date, due_date, status) VALUES (?, ?, ?, ?, 'issued')", rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def scan_rate(lookup, payloads):
+    start = time.perf_counter()
+    for payload in payloads:
+        result = lookup.lookup(payload)
+        assert result is not None
+    return len(payloads) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--scans', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added per query")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'kiosk.db')
+    create_database(path, books=5000, students=args.students)
+    seed_issues(path, args.students)
+    db = DatabaseManager(pool_size=1, backend=StandInBackend(path, args.latency))
+
+    rng = random.Random(5)
+    scans = min(args.scans, args.students)
+    # Cold: every scan is a student the cache has not seen
+    cold_ids = rng.sample(range(1, args.students + 1), scans)
+    payloads = [encode_payload(student_id, KEY) for student_id in cold_ids]
+
+    start = time.perf_counter()
+    for payload in payloads:
+        decode_payload(payload, KEY)
+    decode = scans / (time.perf_counter() - start)
+
+    lookup = StudentLookup(db, KEY, max_students=args.students)
+    cold = scan_rate(lookup, payloads)
+    cold_stats = dict(lookup.stats)
+    # Warm: the same students again, now all cached
+    rng.shuffle(payloads)
+    warm = scan_rate(lookup, payloads)
+
+    sample = lookup.lookup(payloads[0])
+    print(f"{args.students} students, {scans} scans, {args.latency * 1000:.1f} ms per query")
+    print(f"example payload: {payloads[0]} -> {sample['student']['name']}, "
+          f"{len(sample['issues'])} out, ${sample['fines']:.2f} fines")
+    print(f"{'path':<26} {'scans/s':>10}")
+    print(f"{'decode + verify only':<26} {decode:>10,.0f}")
+    print(f"{'cold cache':<26} {cold:>10,.0f}   ({cold_stats['misses']} misses)")
+    print(f"{'warm cache':<26} {warm:>10,.0f}   ({lookup.stats['hits']} hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Login Benchmark
+Logs in concurrently through DatabaseManager.verify_login on the SQLite
+stand-in database and reports logins/s and latency for each kind of
+attempt: first logins on legacy SHA-256 accounts (which upgrade them to
+bcrypt), logins on bcrypt accounts, wrong passwords, the same wrong
+password retried until the account locks, unknown usernames and student
+logins. Correct bcrypt logins are also timed with a single thread, to show
+how verification scales across the worker threads.
+
+Usage:
+    python benchmarks/bench_login.py --accounts 40 --threads 8 --rounds 10
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credentials import LoginGuard, LoginThrottled, hash_password
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+def seed_librarians(db, accounts, rounds):
+    """librarian0..N, every other one still on a legacy SHA-256 hash"""
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        for n in range(accounts):
+            password = f"secret{n}"
+            stored = hashlib.sha256(password.encode()).hexdigest() if n % 2 else hash_password(password, rounds)
+            cursor.execute(
+                "INSERT INTO librarians (username, password, full_name) VALUES (%s, %s, %s)",
+                (f"librarian{n}", stored, f"Librarian {n}")
+            )
+        conn.commit()
+
+
+def legacy_count(db):
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM librarians WHERE password NOT LIKE '$2%'")
+        return cursor.fetchone()[0]
+
+
+def attempt(db, username, password, user_type):
+    """'ok', 'failed' or 'locked', and the seconds it took"""
+    start = time.perf_counter()
+    try:
+        outcome = 'ok' if db.verify_login(username, password, user_type)[0] else 'failed'
+    except LoginThrottled:
+        outcome = 'locked'
+    return outcome, time.perf_counter() - start
+
+
+def timed(db, attempts, threads):
+    """Run attempts on threads; returns (logins/s, latencies, outcome counts)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda a: attempt(db, *a), attempts))
+    elapsed = time.perf_counter() - start
+    outcomes = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return len(attempts) / elapsed, [latency for _, latency in results], outcomes
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=40, help="librarian accounts")
+    parser.add_argument('--threads', type=int, default=8, help="concurrent logins")
+    parser.add_argument('--rounds', type=int, default=10, help="bcrypt cost factor")
+    parser.add_argument('--repeats', type=int, default=5, help="correct logins per account")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added per query")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'login.db')
+    create_database(path, books=10, students=1000)
+    db = DatabaseManager(pool_size=args.threads, backend=StandInBackend(path, args.latency),
+                         bcrypt_rounds=args.rounds)
+    seed_librarians(db, args.accounts, args.rounds)
+    accounts = range(args.accounts)
+    legacy = [n for n in accounts if n % 2]
+
+    runs = [
+        ('legacy, upgraded', [(f"librarian{n}", f"secret{n}", 'librarian') for n in legacy]),
+        ('bcrypt, correct', [(f"librarian{n}", f"secret{n}", 'librarian')
+                             for _ in range(args.repeats) for n in accounts]),
+        ('wrong password', [(f"librarian{n}", f"guess{k}", 'librarian') for k in range(3) for n in accounts]),
+        ('same wrong, retried', [(f"librarian{n}", "guess0", 'librarian') for _ in range(20) for n in accounts]),
+        ('unknown user', [(f"nobody{n}", "guess", 'librarian') for n in accounts]),
+        ('student', [(f"student{n % 1000 + 1}@example.com", '', 'student') for n in range(5000)]),
+    ]
+
+    print(f"{args.accounts} librarians ({len(legacy)} on SHA-256), bcrypt cost {args.rounds}, "
+          f"{args.threads} threads, {args.latency * 1000:.1f} ms per query")
+    print(f"{'attempts':<22} {'count':>6} {'logins/s':>10} {'p50 ms':>8} {'p99 ms':>8}   outcomes")
+    for label, attempts in runs:
+        rate, latencies, outcomes = timed(db, attempts, args.threads)
+        summary = ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+        print(f"{label:<22} {len(attempts):>6} {rate:>10,.1f} {percentile(latencies, 0.5):>8.2f} "
+              f"{percentile(latencies, 0.99):>8.2f}   {summary}")
+    print(f"legacy hashes left: {legacy_count(db)}; guard: {db.logins.stats}")
+
+    # Same correct logins on one thread, for the scaling comparison; the
+    # wrong-password runs above left every account locked
+    db.logins = LoginGuard(db.logins.max_failures, db.logins.window)
+    attempts = runs[1][1]
+    single, _, _ = timed(db, attempts, 1)
+    threaded, _, _ = timed(db, attempts, args.threads)
+    print(f"\nbcrypt logins/s: {single:,.1f} on 1 thread, {threaded:,.1f} on {args.threads} "
+          f"({threaded / single:.2f}x, {os.cpu_count()} CPUs)")
+    db.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Overdue Tracking Benchmark
+Compares the overdue count and first overdue page computed by SQL on
+every call (the old get_statistics subquery and overdue screen query)
+with the in-memory overdue tracker, on the SQLite stand-in database
+
+Usage:
+    python benchmarks/bench_overdue.py --issues 1000000 --open 0.3 --calls 200
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+OLD_COUNT = """
+    SELECT COUNT(*) FROM issues
+    WHERE status = 'issued' AND due_date < CURDATE()
+"""
+
+OLD_PAGE = """
+    SELECT i.issue_id, b.title, s.name as student_name, i.issue_date, i.due_date,
+           DATEDIFF(CURDATE(), i.due_date) as days_overdue
+    FROM issues i
+    JOIN books b ON i.book_id = b.book_id
+    JOIN students s ON i.student_id = s.student_id
+    WHERE i.status = 'issued' AND i.due_date < CURDATE()
+    ORDER BY days_overdue DESC
+    LIMIT 50
+"""
+
+
+def seed(path, total, open_share, books=5000, students=2000):
+    """Issues over the last two years; the newest open_share are still out"""
+    conn = sqlite3.connect(path)
+    today = date.today()
+    open_from = int(total * (1 - open_share))
+    for start in range(0, total, 100000):
+        rows = []
+        for i in range(start, min(start + 100000, total)):
+            issued = today - timedelta(days=(total - i) * 730 // total)
+            status = 'issued' if i >= open_from else 'returned'
+            rows.append((i % books + 1, i % students + 1, issued, issued + timedelta(days=14), status))
+        conn.executemany(
+            "INSERT INTO issues (book_id, student_id, issue_date, due_date, status) VALUES (?, ?, ?, ?, ?)", rows
+        )
+    conn.commit()
+    conn.close()
+
+
+def timed(calls, func):
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=1000000)
+    parser.add_argument('--open', type=float, default=0.3, help="share of issues still open")
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'overdue.db')
+    create_database(path, books=5000, students=2000)
+    seed(path, args.issues, args.open)
+    db = DatabaseManager(pool_size=1, backend=StandInBackend(path))
+
+    def old_query(sql):
+        with db.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    start = time.perf_counter()
+    db.refresh_overdue(force=True)
+    load_ms = (time.perf_counter() - start) * 1000
+    today = date.today()
+
+    old_count = old_query(OLD_COUNT)[0][0]
+    new_count = db.overdue.overdue_count(today)
+    assert old_count == new_count, (old_count, new_count)
+    # Ties on due date may come back in either order
+    old_due = [row[4] for row in old_query(OLD_PAGE)]
+    new_due = [row['due_date'] for row in db.get_overdue_page(limit=50)]
+    assert old_due == new_due, "first pages differ"
+
+    print(f"{args.issues} issues, {len(db.overdue)} open, {new_count} overdue; tracker load {load_ms:.0f} ms")
+    print(f"{'operation':<22} {'SQL ms':>10} {'tracker ms':>11}")
+    print(f"{'overdue count':<22} {timed(args.calls, lambda: old_query(OLD_COUNT)):>10.3f} "
+          f"{timed(args.calls, lambda: db.overdue.overdue_count(today)):>11.3f}")
+    print(f"{'first overdue page':<22} {timed(args.calls, lambda: old_query(OLD_PAGE)):>10.3f} "
+          f"{timed(args.calls, lambda: db.get_overdue_page(limit=50)):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Password Migration Benchmark
+Seeds a SQLite database with librarians on the old SHA-256 hashes, runs
+password.py's batch migration over them with each --workers count (on a
+fresh copy each time) and reports hashes/s, then checks that migrated
+accounts still log in and are upgraded to plain bcrypt when they do.
+
+Usage:
+    python benchmarks/bench_password_migration.py --accounts 2000 --rounds 10 --workers 1 2 4
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credentials import WRAPPED_PREFIX
+from password import migrate
+from standin_db import create_database
+from library_management_system import DatabaseManager
+
+
+def seed_librarians(path, accounts):
+    """librarian0..N with SHA-256 hashes of secret0..N, as setup_database.py used to write"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS librarians (
+            librarian_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(100) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            full_name VARCHAR(255),
+            email VARCHAR(255),
+            role VARCHAR(50) DEFAULT 'librarian'
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO librarians (username, password, full_name) VALUES (?, ?, ?)",
+        [(f"librarian{n}", hashlib.sha256(f"secret{n}".encode()).hexdigest(), f"Librarian {n}")
+         for n in range(accounts)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def hash_kinds(path):
+    conn = sqlite3.connect(path)
+    kinds = {'sha256': 0, 'wrapped': 0, 'bcrypt': 0}
+    for (stored,) in conn.execute("SELECT password FROM librarians"):
+        kinds['wrapped' if stored.startswith(WRAPPED_PREFIX) else 'bcrypt' if stored.startswith('$2')
+              else 'sha256'] += 1
+    conn.close()
+    return kinds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=10, help="bcrypt cost factor")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--logins', type=int, default=20, help="migrated accounts logged in afterwards")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    seed = os.path.join(directory, 'seed.db')
+    create_database(seed, books=10, students=10)
+    seed_librarians(seed, args.accounts)
+
+    print(f"{args.accounts} SHA-256 accounts, bcrypt cost {args.rounds}, batches of {args.batch_size}, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'seconds':>9} {'hashes/s':>10} {'per worker':>11}")
+    path = None
+    for workers in args.workers:
+        path = os.path.join(directory, f"migrate_{workers}.db")
+        shutil.copyfile(seed, path)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            migrate(f"sqlite:///{path}", rounds=args.rounds, workers=workers, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        kinds = hash_kinds(path)
+        assert kinds['sha256'] == 0, kinds
+        rate = args.accounts / elapsed
+        print(f"{workers:>7} {elapsed:>9.1f} {rate:>10,.1f} {rate / workers:>11,.1f}")
+
+    # Migrated accounts keep their passwords, and move to plain bcrypt on login
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = DatabaseManager(pool_size=1, backend=f"sqlite:///{path}", bcrypt_rounds=args.rounds)
+    logins = min(args.logins, args.accounts)
+    ok = sum(db.verify_login(f"librarian{n}", f"secret{n}", 'librarian')[0] for n in range(logins))
+    wrong = sum(db.verify_login(f"librarian{n}", "wrong", 'librarian')[0] for n in range(logins))
+    db.pool.close()
+    print(f"\nafter migration: {ok}/{logins} logins accepted, {wrong} wrong passwords accepted; "
+          f"hashes now {hash_kinds(path)}")
+
+
+if __name__ == "__main__":
+    main()
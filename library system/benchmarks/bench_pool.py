@@ -0,0 +1,73 @@
+"""
+Connection Pool Benchmark
+Runs concurrent issue/return calls through DatabaseManager against a
+local stand-in database, comparing one shared connection (pool size 1)
+with a pool of connections
+
+Usage:
+    python benchmarks/bench_pool.py --threads 8 --cycles 25 --latency 0.002
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+def run_workload(db, threads, cycles, books):
+    """Each thread issues a book and returns it, ``cycles`` times"""
+    errors = []
+
+    def desk(student_id):
+        for n in range(cycles):
+            book_id = (student_id * cycles + n) % books + 1
+            ok, msg = db.issue_book(book_id, student_id)
+            if not ok:
+                errors.append(msg)
+                continue
+            for record in db.get_student_history(student_id):
+                if record['status'] == 'issued':
+                    ok, msg = db.return_book(record['issue_id'])
+                    if not ok:
+                        errors.append(msg)
+
+    workers = [threading.Thread(target=desk, args=(i + 1,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8, help="concurrent desks")
+    parser.add_argument('--cycles', type=int, default=25, help="issue/return cycles per desk")
+    parser.add_argument('--latency', type=float, default=0.002, help="simulated round trip in seconds")
+    parser.add_argument('--pool-sizes', default="1,4,8", help="comma separated pool sizes to compare")
+    args = parser.parse_args()
+
+    books = 200
+    path = os.path.join(tempfile.mkdtemp(), 'standin.db')
+
+    print(f"{'pool':>6} {'seconds':>10} {'ops/s':>10} {'errors':>8}")
+    for size in [int(s) for s in args.pool_sizes.split(',')]:
+        create_database(path, books=books, students=args.threads)
+        db = DatabaseManager(pool_size=size, backend=StandInBackend(path, args.latency))
+        elapsed, errors = run_workload(db, args.threads, args.cycles, books)
+        db.pool.close()
+
+        ops = args.threads * args.cycles * 2
+        print(f"{size:>6} {elapsed:>10.3f} {ops / elapsed:>10.1f} {len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
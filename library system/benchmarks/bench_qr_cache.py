@@ -0,0 +1,83 @@
+"""
+QR Code Cache Benchmark
+Times opening a student's history QR code the old way (encode on every
+open) against the QR cache: a memory hit, a disk hit after a restart,
+and a first render. Then runs pregenerate_qr over the stand-in database
+with one and with several worker processes, and once more over a filled
+directory, which only has to check for existing files.
+
+Usage:
+    python benchmarks/bench_qr_cache.py --students 2000 --opens 500 --workers 4
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import library_management_system as lms
+import pregenerate_qr
+from qr_cache import QRCodeCache, render_qr
+from standin_db import create_database
+
+
+def timed(calls, func):
+    times = []
+    for n in range(calls):
+        start = time.perf_counter()
+        func(n)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--opens', type=int, default=500, help="history dialogs opened per measurement")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    directory = os.path.join(tempfile.mkdtemp(), 'qr_cache')
+    # A librarian keeps reopening the same few dozen students
+    working_set = [rng.randint(1, args.students) for _ in range(40)]
+
+    def old_open(n):
+        student_id = working_set[n % len(working_set)]
+        payload = f"Student ID: {student_id}"
+        lms.Image.open(lms.io.BytesIO(render_qr(payload, 10, 4, lms.COLORS['primary'], 'white', 200))).load()
+
+    def cached_open(n):
+        lms.history_qr_image(working_set[n % len(working_set)]).load()
+
+    def first_open(n):
+        lms.history_qr_image(args.students + n + 1).load()
+
+    print(f"{'history QR code':<28} {'ms/open':>8}")
+    print(f"{'encode every time (old)':<28} {timed(args.opens, old_open):>8.3f}")
+    lms.qr_codes = QRCodeCache(lms.QR_CACHE_ENTRIES, lms.QR_CACHE_BYTES, directory)
+    print(f"{'first render (+ disk write)':<28} {timed(min(args.opens, 200), first_open):>8.3f}")
+    for student_id in working_set:
+        lms.history_qr_image(student_id)
+    print(f"{'memory hit':<28} {timed(args.opens, cached_open):>8.3f}")
+    lms.qr_codes = QRCodeCache(lms.QR_CACHE_ENTRIES, lms.QR_CACHE_BYTES, directory)
+    print(f"{'disk hit (after restart)':<28} {timed(len(working_set), cached_open):>8.3f}")
+
+    path = os.path.join(tempfile.mkdtemp(), 'qr.db')
+    create_database(path, books=10, students=args.students)
+    lms.DB_BACKEND, lms.SQLITE_PATH = 'sqlite', path
+    for workers in sorted({1, args.workers}):
+        directory = os.path.join(tempfile.mkdtemp(), 'qr_cache')
+        print(f"\npregenerate_qr, {workers} worker(s), {args.students} students:")
+        pregenerate_qr.pregenerate_qr(directory=directory, workers=workers)
+    print("\npregenerate_qr again over the filled directory:")
+    pregenerate_qr.pregenerate_qr(directory=directory, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Read Replica Benchmark
+Runs circulation desks (issue and return) against a primary database
+while report threads pull the issued, overdue and statistics views, first
+with every read on the primary and then with reads routed to a replica.
+
+Both databases are local SQLite stand-in files. A replicator thread copies
+the primary into the replica every --sync seconds and the replica reports
+its lag as the time since the last copy; halfway through the routed run
+replication pauses, so reads must fall back to the primary once the lag
+passes --max-lag.
+
+Usage:
+    python benchmarks/bench_replicas.py --issues 50000 --desks 4 --reporters 4 --seconds 10
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+
+class Replicator:
+    """Copies the primary file into the replica file on an interval"""
+
+    def __init__(self, primary, replica, interval):
+        self.primary = primary
+        self.replica = replica
+        self.interval = interval
+        self.synced_at = 0.0
+        self.paused = False
+        self._stop = threading.Event()
+        self.sync()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def sync(self):
+        source = sqlite3.connect(self.primary)
+        target = sqlite3.connect(self.replica, timeout=30)
+        source.backup(target)
+        target.close()
+        source.close()
+        self.synced_at = time.monotonic()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.paused:
+                self.sync()
+
+    def lag(self):
+        return time.monotonic() - self.synced_at
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class ReplicaBackend(StandInBackend):
+    """Stand-in replica whose lag is the time since the last copy"""
+
+    def __init__(self, path, replicator, latency=0.0):
+        super().__init__(path, latency)
+        self.replicator = replicator
+
+    def replica_lag(self, conn):
+        return self.replicator.lag()
+
+
+def seed_issues(path, count, books, students):
+    """Open loans, a third of them overdue, for the reports to chew on"""
+    conn = sqlite3.connect(path)
+    today = date.today()
+    conn.executemany(
+        "INSERT INTO issues (book_id, student_id, issue_date, due_date, status) VALUES (?, ?, ?, ?, 'issued')",
+        [(i % books + 1, i % students + 1, today - timedelta(days=i % 30),
+          today - timedelta(days=i % 30) + timedelta(days=21)) for i in range(count)]
+    )
+    conn.execute("UPDATE books SET available = available - (SELECT COUNT(*) FROM issues WHERE issues.book_id = books.book_id)")
+    conn.commit()
+    conn.close()
+
+
+def run(db, args, replicator=None):
+    """Return (issue latencies, report latencies) gathered for args.seconds"""
+    stop = threading.Event()
+    issue_times, report_times = [], []
+    lock = threading.Lock()
+
+    def desk(n):
+        rng = random.Random(n)
+        while not stop.is_set():
+            start = time.perf_counter()
+            db.issue_book(rng.randint(1, args.books), n + 1)
+            elapsed = time.perf_counter() - start
+            with lock:
+                issue_times.append(elapsed)
+            issues = db.get_issues_page(limit=1, filters={'student_id': n + 1, 'status': 'issued'})
+            if issues:
+                db.return_book(issues[0]['issue_id'])
+
+    def reporter(n):
+        reports = [lambda: db.get_issued_books(limit=500), db.get_overdue_books, db.get_statistics]
+        while not stop.is_set():
+            start = time.perf_counter()
+            db.invalidate_statistics()
+            reports[n % len(reports)]()
+            elapsed = time.perf_counter() - start
+            with lock:
+                report_times.append(elapsed)
+
+    threads = [threading.Thread(target=desk, args=(n,)) for n in range(args.desks)]
+    threads += [threading.Thread(target=reporter, args=(n,)) for n in range(args.reporters)]
+    for thread in threads:
+        thread.start()
+    if replicator:
+        time.sleep(args.seconds / 2)
+        replicator.paused = True
+        time.sleep(args.seconds / 2)
+    else:
+        time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return issue_times, report_times
+
+
+def percentiles(values):
+    values = sorted(values)
+    return statistics.median(values) * 1000, values[int(len(values) * 0.95)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=50000, help="open loans seeded before the run")
+    parser.add_argument('--books', type=int, default=2000)
+    parser.add_argument('--desks', type=int, default=4)
+    parser.add_argument('--reporters', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--sync', type=float, default=1.0, help="seconds between replica copies")
+    parser.add_argument('--max-lag', type=float, default=3.0, help="staleness bound in seconds")
+    parser.add_argument('--latency', type=float, default=0.0005, help="simulated round trip in seconds")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    primary = os.path.join(directory, 'primary.db')
+    replica = os.path.join(directory, 'replica.db')
+    create_database(primary, books=args.books, students=max(args.desks, 100), copies=100)
+    seed_issues(primary, args.issues, args.books, max(args.desks, 100))
+    pool_size = args.desks + args.reporters
+
+    db = DatabaseManager(pool_size=pool_size, backend=StandInBackend(primary, args.latency))
+    issue_times, report_times = run(db, args)
+    rows = [("primary only", issue_times, report_times, db.reads.stats)]
+
+    replicator = Replicator(primary, replica, args.sync)
+    db = DatabaseManager(pool_size=pool_size, backend=StandInBackend(primary, args.latency),
+                         replicas=[ReplicaBackend(replica, replicator, args.latency)],
+                         max_replica_lag=args.max_lag)
+    db.reads.check_interval = min(db.reads.check_interval, args.max_lag / 2)
+    issue_times, report_times = run(db, args, replicator)
+    replicator.stop()
+    rows.append(("with replica", issue_times, report_times, db.reads.stats))
+
+    print(f"{args.desks} desks, {args.reporters} report threads, {args.issues} open loans, "
+          f"{args.seconds:.0f}s per run (replication paused after {args.seconds / 2:.0f}s)")
+    print(f"{'mode':<14} {'issues/s':>9} {'issue p50':>10} {'issue p95':>10} {'reports/s':>10} "
+          f"{'report p50':>11} {'replica':>8} {'primary':>8} {'stale':>6}")
+    for mode, issues, reports, stats in rows:
+        issue_p50, issue_p95 = percentiles(issues)
+        report_p50, _ = percentiles(reports)
+        print(f"{mode:<14} {len(issues) / args.seconds:>9.0f} {issue_p50:>10.2f} {issue_p95:>10.2f} "
+              f"{len(reports) / args.seconds:>10.0f} {report_p50:>11.2f} {stats['replica_reads']:>8} "
+              f"{stats['primary_reads']:>8} {stats['stale_skips']:>6}")
+    print(f"counter drift on primary: {db.reconcile_counters(fix=False) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
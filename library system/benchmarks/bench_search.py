@@ -0,0 +1,104 @@
+"""
+Catalogue Search Benchmark
+Times DatabaseManager.search_books over a synthetic catalogue on the
+SQLite stand-in database (FTS5 in place of the MySQL FULLTEXT index)
+
+Usage:
+    python benchmarks/bench_search.py --books 500000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_db import StandInBackend, create_database
+from library_management_system import DatabaseManager
+
+SYLLABLES = ['an', 'bel', 'cor', 'dra', 'en', 'fal', 'gor', 'hin', 'is', 'jor', 'kel', 'lum',
+             'mar', 'nor', 'ost', 'pra', 'quin', 'ros', 'sel', 'tor', 'ul', 'ven', 'wal', 'yor']
+
+
+def make_vocabulary(rng, size=20000):
+    """Pseudo-words; titles draw from them with a long-tailed distribution"""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.sample(SYLLABLES, rng.randint(2, 4))))
+    return sorted(words)
+
+
+SURNAMES = ['Smith', 'Garcia', 'Okafor', 'Tanaka', 'Novak', 'Rossi', 'Dubois', 'Khan', 'Larsen', 'Silva']
+CATEGORIES = ['Fiction', 'Science', 'History', 'Programming', 'Mathematics', 'Business', 'Biography']
+
+
+def load_catalogue(path, count, seed=7):
+    """Replace the stand-in books with count synthetic titles"""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    conn = sqlite3.connect(path)
+    conn.execute("DELETE FROM books")
+    batch = []
+    for i in range(1, count + 1):
+        title = " ".join(rng.choices(vocabulary, weights, k=rng.randint(2, 5))).title()
+        author = f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(SURNAMES)}"
+        batch.append((title, author, f"ISBN-{i:010d}", rng.choice(CATEGORIES), 2, 2))
+        if len(batch) == 50000:
+            conn.executemany("INSERT INTO books (title, author, isbn, category, quantity, available) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        conn.executemany("INSERT INTO books (title, author, isbn, category, quantity, available) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+    return vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=500000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'search.db')
+    create_database(path, books=0, students=1)
+    vocabulary = load_catalogue(path, args.books)
+
+    start = time.perf_counter()
+    db = DatabaseManager(pool_size=1, backend=StandInBackend(path))
+    print(f"Indexed {args.books} titles in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(11)
+    queries = []
+    for _ in range(args.queries):
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(rng.choice(vocabulary)[:rng.randint(3, 6)])   # prefix while typing
+        elif kind < 0.8:
+            queries.append(" ".join(rng.sample(vocabulary, 2)))        # two words
+        else:
+            queries.append(f"{rng.choice(SURNAMES)} {rng.choice(CATEGORIES)}")
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        db.search_books(query, limit=args.limit)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(f"queries: {len(timings)}")
+    print(f"p50: {statistics.median(timings):.2f} ms")
+    print(f"p95: {timings[int(len(timings) * 0.95) - 1]:.2f} ms")
+    print(f"max: {timings[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
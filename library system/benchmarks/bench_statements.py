@@ -0,0 +1,106 @@
+"""
+Prepared Statement Benchmark
+Calls the hot DatabaseManager queries (login, student history, issue and
+return) with and without the per-connection statement cache and reports
+the mean per-call latency of each, followed by the cache's hit counts
+
+SQLite already keeps parsed statements per connection, so the stand-in
+run shows only the client-side difference; --mysql runs against a scratch
+database on the DB_CONFIG server, where parsing is saved on every call.
+
+Usage:
+    python benchmarks/bench_statements.py --calls 100000
+    python benchmarks/bench_statements.py --calls 100000 --mysql
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_backends import mysql_backend
+from standin_db import StandInBackend
+from library_management_system import DatabaseManager
+
+
+def seeded_manager(backend, prepared):
+    # The lowest bcrypt cost, so librarian logins time the query, not the hash
+    db = DatabaseManager(pool_size=1, backend=backend, prepared_statements=prepared, bcrypt_rounds=4)
+    for i in range(1, 201):
+        db.add_book(f"Book {i:06d}", f"Author {i % 97}", f"ISBN-{i:09d}", f"Category {i % 12}", 1000)
+    for i in range(1, 51):
+        db.add_student(f"Student {i:06d}", f"student{i}@example.com", f"{i:010d}", f"{i} Main Street")
+    return db
+
+
+def run(db, calls):
+    """Spread calls over the hot queries and return {query: mean µs}"""
+    rounds = calls // 5
+    timings = {'login_librarian': 0.0, 'login_student': 0.0, 'student_history': 0.0,
+               'issue_book': 0.0, 'return_book': 0.0}
+    for n in range(rounds):
+        student_id = n % 50 + 1
+
+        start = time.perf_counter()
+        db.verify_login('admin', 'admin123', 'librarian')
+        timings['login_librarian'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        db.verify_login(f"student{student_id}@example.com", '', 'student')
+        timings['login_student'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        db.get_student_history(student_id)
+        timings['student_history'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        db.issue_book(n % 200 + 1, student_id)
+        timings['issue_book'] += time.perf_counter() - start
+
+        # The issue just made is the newest row
+        with db.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(issue_id) FROM issues")
+            issue_id = cursor.fetchone()[0]
+            cursor.close()
+        start = time.perf_counter()
+        db.return_book(issue_id)
+        timings['return_book'] += time.perf_counter() - start
+    return {name: total / rounds * 1e6 for name, total in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100000, help="timed calls per mode")
+    parser.add_argument('--mysql', action='store_true', help="run against the DB_CONFIG server")
+    args = parser.parse_args()
+
+    results = {}
+    for prepared in (False, True):
+        if args.mysql:
+            backend = mysql_backend()
+            if backend is None:
+                return
+        else:
+            backend = StandInBackend(os.path.join(tempfile.mkdtemp(), 'statements.db'))
+        db = seeded_manager(backend, prepared)
+        results[prepared] = run(db, args.calls)
+        if prepared:
+            hits = db.statements.summary()
+
+    print(f"\n{args.calls} calls per mode")
+    print(f"{'query':<18} {'fresh µs':>10} {'prepared µs':>12} {'change':>8}")
+    for name in results[False]:
+        before, after = results[False][name], results[True][name]
+        print(f"{name:<18} {before:>10.1f} {after:>12.1f} {(after - before) / before:>+8.0%}")
+
+    print(f"\n{'statement':<18} {'prepares':>10} {'hits':>10}")
+    for name, counts in hits.items():
+        print(f"{name:<18} {counts['prepares']:>10} {counts['hits']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Student Card Benchmark
+Runs generate_cards over the stand-in database with 1, 2, 4, ... worker
+processes up to the CPU count and reports cards/s and the speedup over
+one worker, for the multi-page PDF and for PNG files
+
+Usage:
+    python benchmarks/bench_student_cards.py --students 50000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_cards
+import library_management_system as lms
+from standin_db import create_database
+
+
+def timed_run(output, fmt, workers):
+    start = time.perf_counter()
+    # The script's own report is replaced by the table below
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_cards.generate_cards(output, fmt=fmt, workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'cards.db')
+    create_database(path, books=10, students=args.students)
+    lms.DB_BACKEND, lms.SQLITE_PATH = 'sqlite', path
+
+    counts = []
+    workers = 1
+    while workers < args.max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(args.max_workers)
+
+    print(f"{args.students} students, {os.cpu_count()} CPUs")
+    print(f"{'format':<8} {'workers':>8} {'seconds':>9} {'cards/s':>9} {'speedup':>8}")
+    for fmt in ('pdf', 'png'):
+        base = None
+        for workers in counts:
+            output = os.path.join(tempfile.mkdtemp(), 'cards.pdf' if fmt == 'pdf' else 'cards')
+            seconds = timed_run(output, fmt, workers)
+            base = base or seconds
+            print(f"{fmt:<8} {workers:>8} {seconds:>9.1f} {args.students / seconds:>9.1f} {base / seconds:>7.2f}x")
+        if fmt == 'pdf':
+            print(f"{'':<8} PDF size {os.path.getsize(output) / 2 ** 20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
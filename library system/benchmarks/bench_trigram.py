@@ -0,0 +1,92 @@
+"""
+Trigram Index Benchmark
+Builds TrigramIndex over a synthetic catalogue and times fuzzy lookups
+with typos injected into real titles and authors
+
+Usage:
+    python benchmarks/bench_trigram.py --books 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trigram_index import TrigramIndex
+
+CONSONANTS = 'bcdfghjklmnprstvwz'
+VOWELS = 'aeiou'
+
+
+def make_word(rng):
+    """Pronounceable pseudo-word of 4 to 9 letters"""
+    letters = []
+    for i in range(rng.randint(4, 9)):
+        letters.append(rng.choice(VOWELS if i % 2 else CONSONANTS))
+    return "".join(letters)
+
+
+def synthetic_books(count, rng):
+    words = list({make_word(rng) for _ in range(50000)})
+    surnames = list({make_word(rng).title() for _ in range(20000)})
+    for book_id in range(1, count + 1):
+        title = " ".join(rng.choice(words) for _ in range(rng.randint(2, 5))).title()
+        author = f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(surnames)}"
+        yield {'book_id': book_id, 'title': title, 'author': author}
+
+
+def typo(text, rng):
+    """Swap, drop or replace one character, as staff do at the desk"""
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    kind = rng.random()
+    if kind < 0.33:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if kind < 0.66:
+        return text[:i] + text[i + 1:]
+    return text[:i] + rng.choice('aeiou') + text[i + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    books = list(synthetic_books(args.books, rng))
+
+    start = time.perf_counter()
+    index = TrigramIndex.from_books(books)
+    build = time.perf_counter() - start
+    print(f"built {len(index)} books in {build:.1f}s, ~{index.memory_usage() / 1_048_576:.0f} MB")
+
+    timings = []
+    found = 0
+    for _ in range(args.queries):
+        book = rng.choice(books)
+        if rng.random() < 0.5:
+            query = typo(book['author'].split()[-1], rng)
+        else:
+            query = " ".join(typo(word, rng) for word in book['title'].split()[:2])
+        start = time.perf_counter()
+        results = index.search(query, limit=20)
+        timings.append((time.perf_counter() - start) * 1000)
+        # Surnames repeat across books, so any book by the same surname is a hit
+        surname = book['author'].split()[-1]
+        found += any(book_id == book['book_id'] or books[book_id - 1]['author'].endswith(surname)
+                     for book_id, _ in results)
+
+    timings.sort()
+    print(f"queries: {len(timings)}, target found in top 20: {found / len(timings):.0%}")
+    print(f"p50: {statistics.median(timings):.2f} ms")
+    print(f"p95: {timings[int(len(timings) * 0.95) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Virtual Table Benchmark
+Measures time-to-first-paint and per-step scroll cost of VirtualTreeview
+against a plain ttk.Treeview filled up front, over synthetic rows
+
+Needs a display (run under Xvfb on headless machines).
+
+Usage:
+    python benchmarks/bench_virtual_table.py --rows 10000,100000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_management_system import VirtualTreeview
+
+COLUMNS = ('ID', 'Title', 'Author', 'ISBN', 'Category', 'Total', 'Available')
+
+
+def make_rows(count):
+    return [
+        {'book_id': i, 'title': f"Book {i:07d}", 'author': f"Author {i % 997}",
+         'isbn': f"ISBN-{i:010d}", 'category': f"Category {i % 12}", 'quantity': 3, 'available': 2}
+        for i in range(count)
+    ]
+
+
+def row_values(book):
+    return (book['book_id'], book['title'], book['author'], book['isbn'],
+            book['category'], book['quantity'], book['available'])
+
+
+def paint_plain(root, rows):
+    """Old behaviour: insert every row before the first paint"""
+    frame = tk.Frame(root)
+    frame.pack(fill='both', expand=True)
+    start = time.perf_counter()
+    tree = ttk.Treeview(frame, columns=COLUMNS, show='headings')
+    for book in rows:
+        tree.insert('', 'end', values=row_values(book))
+    tree.pack(fill='both', expand=True)
+    root.update()
+    elapsed = time.perf_counter() - start
+    frame.destroy()
+    return elapsed
+
+
+def paint_virtual(root, rows, scroll_steps):
+    """Virtual table: first page only, then scroll one row at a time"""
+    def fetch_page(last, limit):
+        # rows are ordered by book_id, so the key doubles as the offset
+        start = 0 if last is None else last['book_id'] + 1
+        return rows[start:start + limit]
+
+    frame = tk.Frame(root)
+    frame.pack(fill='both', expand=True)
+    start = time.perf_counter()
+    table = VirtualTreeview(frame, COLUMNS, fetch_page, row_values)
+    table.pack(fill='both', expand=True)
+    root.update()
+    first_paint = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(scroll_steps):
+        table.scroll_by(1)
+        root.update_idletasks()
+    per_step = (time.perf_counter() - start) / scroll_steps
+    frame.destroy()
+    return first_paint, per_step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default="10000,100000,1000000", help="comma separated row counts")
+    parser.add_argument('--plain-limit', type=int, default=100000,
+                        help="skip the plain Treeview above this many rows")
+    parser.add_argument('--scroll-steps', type=int, default=2000)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available: {e}")
+        return
+    root.geometry("1200x700")
+
+    print(f"{'rows':>10} {'plain paint s':>14} {'virtual paint s':>16} {'scroll step ms':>15}")
+    for count in [int(n) for n in args.rows.split(',')]:
+        rows = make_rows(count)
+        plain = paint_plain(root, rows) if count <= args.plain_limit else None
+        first_paint, per_step = paint_virtual(root, rows, args.scroll_steps)
+        plain_text = f"{plain:.3f}" if plain is not None else "skipped"
+        print(f"{count:>10} {plain_text:>14} {first_paint:>16.4f} {per_step * 1000:>15.3f}")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Stand-in Database for Benchmarks
+Seeds SQLite database files for the benchmarks and wraps the SQLite
+backend with optional simulated network latency
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_backends import SQLiteBackend, SQLiteConnection, SQLiteCursor
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS books (
+        book_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title VARCHAR(255) NOT NULL,
+        author VARCHAR(255) NOT NULL,
+        isbn VARCHAR(50) UNIQUE,
+        category VARCHAR(100),
+        quantity INT DEFAULT 1,
+        available INT DEFAULT 1,
+        added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS students (
+        student_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL,
+        email VARCHAR(255) UNIQUE NOT NULL,
+        phone VARCHAR(20),
+        address TEXT,
+        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS librarians (
+        librarian_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username VARCHAR(100) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        full_name VARCHAR(255),
+        email VARCHAR(255),
+        role VARCHAR(50) DEFAULT 'librarian'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS issues (
+        issue_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        book_id INT REFERENCES books(book_id),
+        student_id INT REFERENCES students(student_id),
+        issue_date DATE NOT NULL,
+        due_date DATE NOT NULL,
+        return_date DATE,
+        status VARCHAR(50) DEFAULT 'issued',
+        fine DECIMAL(10,2) DEFAULT 0,
+        damage_charge DECIMAL(10,2) DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_title ON books(title)",
+    "CREATE INDEX IF NOT EXISTS idx_name ON students(name)",
+    "CREATE INDEX IF NOT EXISTS idx_status ON issues(status)",
+    "CREATE INDEX IF NOT EXISTS idx_due_date ON issues(due_date)",
+    "CREATE INDEX IF NOT EXISTS idx_student_id ON issues(student_id)",
+]
+
+class StandInCursor(SQLiteCursor):
+    """SQLiteCursor that pays one simulated round trip per statement"""
+
+    def execute(self, operation, params=()):
+        self._conn.simulate_latency()
+        super().execute(operation, params)
+
+    def executemany(self, operation, seq_params):
+        self._conn.simulate_latency()
+        super().executemany(operation, seq_params)
+
+
+class StandInConnection(SQLiteConnection):
+    """SQLite connection that behaves like one across a network"""
+
+    cursor_class = StandInCursor
+
+    def __init__(self, path, latency=0.0):
+        super().__init__(path)
+        self.latency = latency
+
+    def simulate_latency(self):
+        """Sleep for one network round trip"""
+        if self.latency:
+            time.sleep(self.latency)
+
+    def commit(self):
+        self.simulate_latency()
+        super().commit()
+
+
+class StandInBackend(SQLiteBackend):
+    """SQLite backend whose connections add simulated latency"""
+
+    def __init__(self, path, latency=0.0):
+        super().__init__(path)
+        self.latency = latency
+
+    def connect(self):
+        return StandInConnection(self.path, self.latency)
+
+
+def create_database(path, books=200, students=50, copies=1000):
+    """Create and seed a stand-in database file"""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany(
+        "INSERT INTO books (title, author, isbn, category, quantity, available) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Book {i:06d}", f"Author {i % 97}", f"ISBN-{i:09d}", f"Category {i % 12}", copies, copies)
+         for i in range(1, books + 1)]
+    )
+    conn.executemany(
+        "INSERT INTO students (name, email, phone, address) VALUES (?, ?, ?, ?)",
+        [(f"Student {i:06d}", f"student{i}@example.com", f"{i:010d}", f"{i} Main Street")
+         for i in range(1, students + 1)]
+    )
+    conn.commit()
+    conn.close()
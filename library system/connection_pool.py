@@ -0,0 +1,420 @@
+"""
+Connection Pool
+Thread-safe pool of database connections used by DatabaseManager, and
+its asyncio counterpart used by AsyncDatabaseManager
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection is returned to the pool in time"""
+
+
+class ConnectionPool:
+    """Fixed-size pool with health checks and reconnect on checkout
+
+    Connections are created lazily through the ``connect`` factory, so the
+    pool works with any DB-API style connection (MySQL in production, a
+    local stand-in for benchmarks).  Each database operation checks a
+    connection out, uses it and returns it straight away.
+    """
+
+    def __init__(self, connect, size=5, timeout=10.0, health_check_interval=30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        # Idle connections as a stack: the most recently used (and so most
+        # likely alive) is taken first. The condition guards it and the
+        # slot count, and wakes waiters when either changes
+        self._idle = []
+        self._cond = threading.Condition()
+        self._created = 0
+        self._closed = False
+
+        self.stats = {'checkouts': 0, 'waits': 0, 'reconnects': 0, 'discarded': 0}
+
+    def _new_connection(self):
+        """Open a new connection, releasing its slot if that fails"""
+        try:
+            return self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self):
+        """Give up a connection slot and wake a waiter to use it"""
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn):
+        """Ping a connection, reconnecting it in place when possible"""
+        try:
+            if hasattr(conn, 'ping'):
+                conn.ping(reconnect=True, attempts=1, delay=0)
+                return True
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _discard(self, conn):
+        """Close a broken connection and free its slot"""
+        self._close_quietly(conn)
+        with self._cond:
+            self.stats['discarded'] += 1
+        self._release_slot()
+
+    def checkout(self):
+        """Take a healthy connection from the pool
+
+        Waits up to timeout seconds for a connection to be checked in or
+        for a slot to be freed by a discarded one.
+        """
+        deadline = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolExhaustedError("Connection pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    self.stats['checkouts'] += 1
+                    conn = None
+                    break
+                if deadline is None:
+                    self.stats['waits'] += 1
+                    deadline = time.monotonic() + self.timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(
+                        f"No database connection available after {self.timeout}s"
+                    )
+                self._cond.wait(remaining)
+
+        if conn is None:
+            return self._new_connection()
+
+        # Only ping connections that sat idle long enough to have gone stale
+        if time.monotonic() - last_used >= self.health_check_interval:
+            if not self._is_healthy(conn):
+                # Keep the slot and reconnect into it
+                self._close_quietly(conn)
+                with self._cond:
+                    self.stats['discarded'] += 1
+                    self.stats['reconnects'] += 1
+                conn = self._new_connection()
+
+        with self._cond:
+            self.stats['checkouts'] += 1
+        return conn
+
+    def checkin(self, conn, broken=False):
+        """Return a connection to the pool"""
+        if not broken:
+            try:
+                # End any open transaction so the next user does not see
+                # an old snapshot or inherit uncommitted work
+                conn.rollback()
+            except Exception:
+                broken = True
+
+        if broken or self._closed:
+            self._discard(conn)
+        else:
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of one operation"""
+        with self.lease(self.checkout()) as conn:
+            yield conn
+
+    @contextmanager
+    def lease(self, conn):
+        """Hold a connection already checked out, checking it in afterwards"""
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.checkin(conn, broken=broken)
+
+    def close(self):
+        """Close every idle connection and refuse new checkouts"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+class ReplicaRouter:
+    """Routes read-only work to replicas that are recent enough
+
+    ``replicas`` is a list of (pool, lag_of) pairs, where ``lag_of(conn)``
+    returns how many seconds the replica is behind the primary, or None
+    when that is unknown (replication stopped, or not a replica at all).
+    Each replica's lag is measured at most once per ``check_interval``;
+    replicas behind by more than ``max_lag``, or that cannot be reached,
+    are skipped until the next check and reads fall back to the primary.
+    """
+
+    def __init__(self, primary, replicas=(), max_lag=10.0, check_interval=5.0):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        # replica index -> (lag or None, monotonic time measured)
+        self._lag = {}
+        self._next = 0
+
+        self.stats = {'replica_reads': 0, 'primary_reads': 0, 'stale_skips': 0, 'failures': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _measure(self, index):
+        pool, lag_of = self.replicas[index]
+        try:
+            with pool.connection() as conn:
+                lag = lag_of(conn)
+        except Exception:
+            self._count('failures')
+            lag = None
+        with self._lock:
+            self._lag[index] = (lag, time.monotonic())
+        return lag
+
+    def replica_lag(self, index):
+        """Last measured lag of a replica, re-measured once it is out of date"""
+        with self._lock:
+            lag, measured = self._lag.get(index, (None, None))
+        if measured is None or time.monotonic() - measured >= self.check_interval:
+            lag = self._measure(index)
+        return lag
+
+    def _candidates(self):
+        """Replica indexes in round-robin order"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.replicas), 1)
+        return [(start + n) % len(self.replicas) for n in range(len(self.replicas))]
+
+    def _mark_down(self, index):
+        with self._lock:
+            self._lag[index] = (None, time.monotonic())
+        self._count('failures')
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for one read-only operation"""
+        for index in self._candidates():
+            lag = self.replica_lag(index)
+            if lag is None or lag > self.max_lag:
+                self._count('stale_skips')
+                continue
+            pool, _ = self.replicas[index]
+            try:
+                conn = pool.checkout()
+            except Exception:
+                self._mark_down(index)
+                continue
+            self._count('replica_reads')
+            with pool.lease(conn) as conn:
+                yield conn
+            return
+
+        self._count('primary_reads')
+        with self.primary.connection() as conn:
+            yield conn
+
+    def close(self):
+        for pool, _ in self.replicas:
+            pool.close()
+
+
+class AsyncConnectionPool:
+    """ConnectionPool for asyncio drivers such as aiomysql
+
+    ``connect`` is a coroutine function opening one connection. Coroutines
+    waiting for a connection are suspended instead of holding a thread, so
+    thousands of them can queue on a handful of connections. Same
+    lifecycle as ConnectionPool: lazy creation, rollback on checkin, and a
+    ping before reusing a connection that sat idle for a while.
+    """
+
+    def __init__(self, connect, size=5, timeout=10.0, health_check_interval=30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        # Idle connections as a stack, and the futures of coroutines waiting
+        # for one; the event loop runs one coroutine at a time, so neither
+        # they nor the slot count need a lock
+        self._idle = []
+        self._waiters = deque()
+        self._created = 0
+        self._closed = False
+
+        self.stats = {'checkouts': 0, 'waits': 0, 'reconnects': 0, 'discarded': 0}
+
+    def _wake(self):
+        """Tell the longest waiting coroutine to look again"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _new_connection(self):
+        """Open a new connection, releasing its slot if that fails"""
+        try:
+            return await self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self):
+        self._created -= 1
+        self._wake()
+
+    async def _is_healthy(self, conn):
+        try:
+            await conn.ping(reconnect=True)
+            return True
+        except Exception:
+            return False
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        self.stats['discarded'] += 1
+        self._release_slot()
+
+    async def checkout(self):
+        """Take a healthy connection from the pool
+
+        Waits up to timeout seconds for a connection to be checked in or
+        for a slot to be freed by a discarded one.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None
+        while True:
+            if self._closed:
+                raise PoolExhaustedError("Connection pool is closed")
+            if self._idle:
+                conn, last_used = self._idle.pop()
+                break
+            if self._created < self.size:
+                self._created += 1
+                self.stats['checkouts'] += 1
+                return await self._new_connection()
+            if deadline is None:
+                self.stats['waits'] += 1
+                deadline = loop.time() + self.timeout
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise PoolExhaustedError(
+                    f"No database connection available after {self.timeout}s"
+                )
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # Pass on a wake-up this coroutine will no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+
+        if time.monotonic() - last_used >= self.health_check_interval:
+            if not await self._is_healthy(conn):
+                # Keep the slot and reconnect into it
+                self._close_quietly(conn)
+                self.stats['discarded'] += 1
+                self.stats['reconnects'] += 1
+                conn = await self._new_connection()
+
+        self.stats['checkouts'] += 1
+        return conn
+
+    async def checkin(self, conn, broken=False):
+        """Return a connection to the pool"""
+        if not broken:
+            try:
+                await conn.rollback()
+            except Exception:
+                broken = True
+
+        if broken or self._closed:
+            self._discard(conn)
+        else:
+            self._idle.append((conn, time.monotonic()))
+            self._wake()
+
+    @asynccontextmanager
+    async def connection(self):
+        """Check out a connection for the duration of one operation"""
+        conn = await self.checkout()
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            try:
+                await conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            await self.checkin(conn, broken=broken)
+
+    def close(self):
+        """Close every idle connection and refuse new checkouts"""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
@@ -0,0 +1,166 @@
+"""
+Credentials
+Password hashing for librarian logins (bcrypt, plus the SHA-256 digests
+older versions stored and password.py --migrate wraps), and a failed-login
+cache that rate-limits repeated bad attempts before they cost a query or a
+bcrypt check
+"""
+
+import hashlib
+import hmac
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+
+import bcrypt
+
+
+class LoginThrottled(Exception):
+    """Too many failed logins for one account; retry_after is in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many failed attempts. Try again in {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+# Marks a legacy SHA-256 digest that password.py --migrate wrapped in
+# bcrypt without knowing the password: the rest is bcrypt of the hex digest
+WRAPPED_PREFIX = 'sha256+'
+
+_SHA256_DIGEST = re.compile(r'[0-9a-f]{64}')
+
+
+def hash_password(password, rounds=12):
+    """bcrypt hash of password, as stored in librarians.password"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def wrap_legacy_hash(digest, rounds=12):
+    """bcrypt-protected form of a stored SHA-256 hex digest"""
+    return WRAPPED_PREFIX + bcrypt.hashpw(digest.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def is_sha256_digest(stored):
+    """True for the bare SHA-256 hex digests older versions stored"""
+    return _SHA256_DIGEST.fullmatch(stored) is not None
+
+
+def is_legacy_hash(stored):
+    """True for SHA-256 digests, bare or wrapped, rather than a bcrypt hash of the password"""
+    return not stored.startswith('$2')
+
+
+def check_password(password, stored):
+    """True if password matches a stored bcrypt hash or a bare or wrapped SHA-256 digest"""
+    if stored.startswith(WRAPPED_PREFIX):
+        password = hashlib.sha256(password.encode()).hexdigest()
+        stored = stored[len(WRAPPED_PREFIX):]
+    elif is_legacy_hash(stored):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+    try:
+        return bcrypt.checkpw(password.encode(), stored.encode())
+    except ValueError:
+        # Malformed hash, or a password longer than bcrypt's 72 bytes
+        return False
+
+
+def needs_rehash(stored, rounds):
+    """True if stored should be replaced by a hash_password(..., rounds) hash"""
+    return is_legacy_hash(stored) or int(stored.split('$')[2]) < rounds
+
+
+class LoginGuard:
+    """Recent login failures per account
+
+    An account with max_failures failures in the last window seconds is
+    locked until the oldest of them expires; attempts on it are refused
+    without a query or a bcrypt check. A password that has already failed
+    against an account's stored hash fails again without a bcrypt check,
+    so a client retrying it costs one indexed query. Misses are keyed on
+    the stored hash as well as the password, so once the password is
+    changed (by any process) they no longer apply; failures on accounts
+    that do not exist count towards the lock but are never cached.
+    Passwords are remembered only as digests under a key made up per
+    process. A successful login clears the account, as does forget(),
+    which writers call when they create an account or set its password.
+    At most max_accounts accounts are tracked, least recently failed
+    first out.
+    """
+
+    def __init__(self, max_failures=5, window=300, max_accounts=10000):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_accounts = max_accounts
+        self._key = secrets.token_bytes(16)
+        # account -> deque of (failed at, digest of stored hash and password, or None)
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'refused': 0, 'cached': 0, 'failed': 0, 'passed': 0}
+
+    def _digest(self, password, stored):
+        return hmac.new(self._key, stored.encode() + b'\0' + password.encode(), hashlib.sha256).digest()
+
+    def _recent(self, account, now):
+        """The account's failures still inside the window; call with the lock held"""
+        failures = self._failures.get(account)
+        if failures is None:
+            return ()
+        while failures and now - failures[0][0] >= self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[account]
+        return failures
+
+    def check(self, account):
+        """Raise LoginThrottled if the account is locked"""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(account, now)
+            if len(failures) >= self.max_failures:
+                self.stats['refused'] += 1
+                raise LoginThrottled(int(failures[0][0] + self.window - now) + 1)
+
+    def known_bad(self, account, password, stored):
+        """True (counting another failure) if password already failed against stored"""
+        now = time.monotonic()
+        digest = self._digest(password, stored)
+        with self._lock:
+            if any(known == digest for _, known in self._recent(account, now)):
+                self.stats['cached'] += 1
+                self._record(account, now, digest)
+                return True
+        return False
+
+    def failed(self, account, password=None, stored=None):
+        """Count a failure the database check found
+
+        Pass the stored hash the password was checked against to cache the
+        miss; without it (no such account) the failure only counts.
+        """
+        digest = self._digest(password, stored) if stored is not None else None
+        with self._lock:
+            self.stats['failed'] += 1
+            self._record(account, time.monotonic(), digest)
+
+    def _record(self, account, now, digest):
+        failures = self._failures.setdefault(account, deque())
+        failures.append((now, digest))
+        self._failures.move_to_end(account)
+        while len(self._failures) > self.max_accounts:
+            self._failures.popitem(last=False)
+
+    def succeeded(self, account):
+        """Forget the account's failures after a successful login"""
+        with self._lock:
+            self.stats['passed'] += 1
+            self._failures.pop(account, None)
+
+    def forget(self, account):
+        """Drop the account's failures, e.g. once it is created or its password set"""
+        with self._lock:
+            self._failures.pop(account, None)
+
+    def __len__(self):
+        return len(self._failures)
@@ -0,0 +1,109 @@
+"""
+Fine Engine
+Overdue fines under per-category rate policies, for one loan at a time
+(returns) or for every open loan in one vectorized pass (reports)
+"""
+
+from datetime import date
+from decimal import Decimal
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python path gives the same results
+    np = None
+
+# No cap is stored as a cap no fine can reach, so capping stays branch-free
+NO_CAP = 2 ** 62
+
+
+def to_cents(amount):
+    return int(round(amount * 100))
+
+
+class FinePolicy:
+    """Charge per day late, after a number of grace days, up to a cap
+
+    A book returned within the grace days costs nothing; after that each
+    day beyond the grace days is charged, so with rate=1 and grace_days=2
+    a book five days late costs $3.  Amounts are kept in cents.
+    """
+
+    def __init__(self, rate=5, grace_days=0, cap=None):
+        self.rate_cents = to_cents(rate)
+        self.grace_days = grace_days
+        self.cap_cents = NO_CAP if cap is None else to_cents(cap)
+
+    def fine_cents(self, days_late):
+        chargeable = days_late - self.grace_days
+        if chargeable <= 0:
+            return 0
+        return min(chargeable * self.rate_cents, self.cap_cents)
+
+
+class FineEngine:
+    """Fine policies by book category, with a default for the rest
+
+    ``policies`` maps a category (or 'default') to FinePolicy keyword
+    arguments, e.g. {'default': {'rate': 5}, 'Reference': {'rate': 2,
+    'grace_days': 1, 'cap': 30}}.  Without a 'default' entry uncategorised
+    books are charged $5 a day, as the library always has.
+    """
+
+    def __init__(self, policies=None):
+        policies = dict(policies or {})
+        self.default = FinePolicy(**policies.pop('default', {}))
+        self.policies = {category: FinePolicy(**options) for category, options in policies.items()}
+
+        # Policy table for the vectorized path: row 0 is the default
+        ordered = [self.default] + list(self.policies.values())
+        self._index = {category: n for n, category in enumerate(self.policies, start=1)}
+        if np is not None:
+            self._rate = np.array([p.rate_cents for p in ordered], dtype=np.int64)
+            self._grace = np.array([p.grace_days for p in ordered], dtype=np.int64)
+            self._cap = np.array([p.cap_cents for p in ordered], dtype=np.int64)
+
+    def table(self):
+        """(category, rate, grace_days, cap) rows for the fine_policies table,
+        'default' first; rate and cap are in dollars, cap None for no cap"""
+        return [(category, Decimal(p.rate_cents) / 100, p.grace_days,
+                 None if p.cap_cents == NO_CAP else Decimal(p.cap_cents) / 100)
+                for category, p in [('default', self.default), *self.policies.items()]]
+
+    def policy(self, category):
+        return self.policies.get(category, self.default)
+
+    def fine(self, due_date, as_of, category=None):
+        """Fine in dollars for one loan due on due_date, as of a date"""
+        return self.policy(category).fine_cents((as_of - due_date).days) / 100
+
+    def _cents(self, due_dates, categories, as_of):
+        """Fines in cents for parallel sequences of due dates and categories"""
+        if np is None:
+            today = as_of.toordinal()
+            return [self.policy(category).fine_cents(today - due.toordinal())
+                    for due, category in zip(due_dates, categories)]
+
+        # Day ordinals convert an order of magnitude faster than datetime64
+        count = len(due_dates)
+        days = as_of.toordinal() - np.fromiter(map(date.toordinal, due_dates), dtype=np.int64, count=count)
+        if self._index:
+            index = np.fromiter(map(self._index.get, categories, repeat(0)), dtype=np.int64, count=count)
+            rate, grace, cap = self._rate[index], self._grace[index], self._cap[index]
+        else:
+            rate, grace, cap = self._rate[0], self._grace[0], self._cap[0]
+        return np.minimum(np.maximum(days - grace, 0) * rate, cap)
+
+    def accrue(self, due_dates, categories, as_of):
+        """Fine in dollars for each loan, in order"""
+        cents = self._cents(due_dates, categories, as_of)
+        if np is not None:
+            return (cents / 100).tolist()
+        return [c / 100 for c in cents]
+
+    def summarize(self, due_dates, categories, as_of):
+        """(total fines in dollars, number of loans with a fine)"""
+        cents = self._cents(due_dates, categories, as_of)
+        if np is not None:
+            return int(cents.sum()) / 100, int(np.count_nonzero(cents))
+        return sum(cents) / 100, sum(1 for c in cents if c)
@@ -0,0 +1,115 @@
+"""
+Student Card Generation Script
+Renders a printable library card, with QR code, for every student and
+writes them as one PNG per student or as a single multi-page PDF.
+Students are read a page at a time and cards are rendered across worker
+processes, so throughput grows with the number of cores.
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from library_management_system import DatabaseManager, student_qr_payload
+from student_cards import CardPdfWriter, card_jpeg, render_card
+
+PAGE_SIZE = 200
+CARD_FIELDS = ('student_id', 'name', 'email', 'registration_date')
+
+
+def _render_pngs(students, directory):
+    """Write one page of cards as PNG files; returns how many were written"""
+    for student in students:
+        card = render_card(student, student_qr_payload(student['student_id']))
+        # Fastest zlib level: compressing took longer than drawing the card
+        card.save(os.path.join(directory, f"card_{student['student_id']:06d}.png"), compress_level=1)
+    return len(students)
+
+
+def _render_jpegs(students):
+    """One page of cards as JPEG bytes, for the PDF"""
+    return [card_jpeg(student, student_qr_payload(student['student_id'])) for student in students]
+
+
+def _student_pages(db):
+    """Every student, a page at a time, by name"""
+    after_name = after_id = None
+    while True:
+        page = db.get_students_page(after_name, after_id, limit=PAGE_SIZE)
+        if not page:
+            return
+        yield [{field: row.get(field) for field in CARD_FIELDS} for row in page]
+        after_name, after_id = page[-1]['name'], page[-1]['student_id']
+
+
+def generate_cards(output, fmt='pdf', workers=None, report_every=5000):
+    """Render every student's card to output (a directory for PNGs, a file for PDF)"""
+
+    print("=" * 60)
+    print("Library Management System - Student Cards")
+    print("=" * 60)
+    print()
+
+    db = DatabaseManager(pool_size=1)
+    if not db.pool:
+        print("❌ Could not connect to the database")
+        return False
+
+    if fmt == 'png':
+        os.makedirs(output, exist_ok=True)
+        pdf = None
+    else:
+        pdf = CardPdfWriter(output)
+
+    workers = workers or os.cpu_count()
+    start = time.perf_counter()
+    cards = 0
+
+    def collect(future):
+        nonlocal cards
+        result = future.result()
+        if pdf is not None:
+            for jpeg in result:
+                pdf.add_page(jpeg)
+            result = len(result)
+        if (cards + result) // report_every > cards // report_every:
+            rate = (cards + result) / (time.perf_counter() - start)
+            print(f"  {cards + result:>10,} cards  {rate:>8,.0f} cards/s")
+        cards += result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A few pages per worker in flight keeps every core busy while
+        # bounding memory; collecting oldest first keeps PDF pages in order
+        pending = deque()
+        for students in _student_pages(db):
+            if fmt == 'png':
+                pending.append(pool.submit(_render_pngs, students, output))
+            else:
+                pending.append(pool.submit(_render_jpegs, students))
+            if len(pending) >= workers * 3:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    if pdf is not None:
+        pdf.close()
+    db.pool.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Cards':<24} {cards:>12,}")
+    print(f"{'Workers':<24} {workers:>12}")
+    print(f"{'Time':<24} {elapsed:>11.1f}s ({cards / elapsed:,.1f} cards/s)")
+    print()
+    print(f"✓ Cards written to {os.path.abspath(output)}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a printable library card for every student")
+    parser.add_argument('output', help="PDF file to write, or directory for --format png")
+    parser.add_argument('--format', choices=('pdf', 'png'), default='pdf', help="one multi-page PDF or a PNG per card")
+    parser.add_argument('--workers', type=int, help="worker processes (default one per CPU)")
+    args = parser.parse_args()
+    generate_cards(args.output, fmt=args.format, workers=args.workers)
@@ -0,0 +1,67 @@
+"""
+Check-in Kiosk
+Self-service lookup for students: scan the QR code from the student
+dashboard or a library card and see the books you have out, what is
+overdue and the fines so far. Barcode scanners type the code and press
+Enter, so the kiosk simply reads lines; an empty line or Ctrl+D quits.
+"""
+
+import argparse
+
+from library_management_system import KIOSK_CACHE_SIZE, KIOSK_CACHE_TTL, QR_SIGNING_KEY, DatabaseManager
+from qr_payload import InvalidPayload
+from student_lookup import StudentLookup
+
+
+def show(result):
+    student = result['student']
+    print(f"👤 {student['name']} (ID {student['student_id']})")
+    if not result['issues']:
+        print("   No books out")
+        return
+    for issue in result['issues']:
+        status = f"{issue['days_overdue']} days overdue, ${issue['fine']:.2f}" if issue['days_overdue'] \
+            else f"due {issue['due_date']}"
+        print(f"   📖 {issue['title'][:40]:<40} {status}")
+    print(f"   {len(result['issues'])} out, {result['overdue']} overdue, fines ${result['fines']:.2f}")
+
+
+def kiosk():
+    """Read scanned codes until an empty line"""
+
+    print("=" * 60)
+    print("Library Management System - Check-in Kiosk")
+    print("=" * 60)
+    print()
+
+    db = DatabaseManager(pool_size=1)
+    if not db.pool:
+        print("❌ Could not connect to the database")
+        return False
+    lookup = StudentLookup(db, QR_SIGNING_KEY, max_students=KIOSK_CACHE_SIZE, max_age=KIOSK_CACHE_TTL)
+
+    while True:
+        try:
+            payload = input("Scan your QR code: ")
+        except EOFError:
+            break
+        if not payload.strip():
+            break
+        try:
+            result = lookup.lookup(payload)
+        except InvalidPayload as e:
+            print(f"❌ {e}")
+            continue
+        if result is None:
+            print("❌ Student not found - please see the librarian")
+        else:
+            show(result)
+        print()
+
+    db.pool.close()
+    return True
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Self-service student lookup by QR code").parse_args()
+    kiosk()
@@ -27,7 +27,8 @@ CREATE TABLE books (
     INDEX idx_title (title),
     INDEX idx_author (author),
     INDEX idx_category (category),
-    INDEX idx_isbn (isbn)
+    INDEX idx_isbn (isbn),
+    FULLTEXT INDEX ft_books (title, author, category)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================================
@@ -88,9 +89,67 @@ CREATE TABLE issues (
     INDEX idx_issue_date (issue_date),
     INDEX idx_due_date (due_date),
     INDEX idx_book_id (book_id),
-    INDEX idx_student_id (student_id)
+    INDEX idx_student_id (student_id),
+    INDEX idx_status_due (status, due_date),
+    INDEX idx_student_status (student_id, status, due_date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ============================================================================
+-- Table: library_counters
+-- Single summary row maintained by the application on every write, so the
+-- dashboard reads its totals without scanning books and issues.
+-- Rebuild it with: python reconcile_counters.py
+-- ============================================================================
+
+DROP TABLE IF EXISTS library_counters;
+
+CREATE TABLE library_counters (
+    counter_id INT PRIMARY KEY,
+    total_books INT NOT NULL DEFAULT 0,
+    total_copies INT NOT NULL DEFAULT 0,
+    available_books INT NOT NULL DEFAULT 0,
+    total_students INT NOT NULL DEFAULT 0,
+    issued_books INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================================
+-- Table: fine_accrual_runs
+-- Checkpoints of the nightly fine accrual (python accrue_fines.py), which
+-- writes the fine accrued so far onto every open issue. An interrupted run
+-- resumes after last_issue_id.
+-- ============================================================================
+
+DROP TABLE IF EXISTS fine_accrual_runs;
+
+CREATE TABLE fine_accrual_runs (
+    run_date DATE PRIMARY KEY,
+    last_issue_id INT NOT NULL DEFAULT 0,
+    rows_scanned INT NOT NULL DEFAULT 0,
+    rows_updated INT NOT NULL DEFAULT 0,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================================
+-- Table: fine_policies
+-- Overdue fine rates by book category, for the overdue_books view and the
+-- CalculateFine procedure. The application rewrites these rows from
+-- FINE_POLICIES whenever it starts; books in categories not listed use the
+-- 'default' row. cap is the most one loan can be charged (NULL for no cap).
+-- ============================================================================
+
+DROP TABLE IF EXISTS fine_policies;
+
+CREATE TABLE fine_policies (
+    category VARCHAR(100) PRIMARY KEY,
+    rate DECIMAL(10,2) NOT NULL,
+    grace_days INT NOT NULL DEFAULT 0,
+    cap DECIMAL(10,2) NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO fine_policies (category, rate, grace_days, cap) VALUES
+('default', 5.00, 0, NULL);
+
 -- ============================================================================
 -- INSERT SAMPLE DATA
 -- ============================================================================
@@ -286,6 +345,18 @@ INSERT INTO issues (book_id, student_id, issue_date, due_date, return_date, stat
 (26, 22, CURDATE() - INTERVAL 70 DAY, CURDATE() - INTERVAL 56 DAY, CURDATE() - INTERVAL 58 DAY, 'returned', 0, 0),
 (28, 25, CURDATE() - INTERVAL 75 DAY, CURDATE() - INTERVAL 61 DAY, CURDATE() - INTERVAL 62 DAY, 'returned', 0, 0);
 
+-- ============================================================================
+-- Library Counters - initial values from the sample data
+-- ============================================================================
+
+INSERT INTO library_counters (counter_id, total_books, total_copies, available_books, total_students, issued_books)
+SELECT 1,
+    (SELECT COUNT(*) FROM books),
+    (SELECT COALESCE(SUM(quantity), 0) FROM books),
+    (SELECT COALESCE(SUM(available), 0) FROM books),
+    (SELECT COUNT(*) FROM students),
+    (SELECT COUNT(*) FROM issues WHERE status = 'issued');
+
 -- ============================================================================
 -- Views for Common Queries
 -- ============================================================================
@@ -312,6 +383,8 @@ WHERE i.status = 'issued'
 ORDER BY i.due_date;
 
 -- View: Overdue Books
+-- calculated_fine applies the book category's fine_policies row (rate,
+-- grace days, cap), as fine_engine.py does for returns
 CREATE OR REPLACE VIEW overdue_books AS
 SELECT 
     i.issue_id,
@@ -322,10 +395,19 @@ SELECT
     i.issue_date,
     i.due_date,
     DATEDIFF(CURDATE(), i.due_date) AS days_overdue,
-    DATEDIFF(CURDATE(), i.due_date) * 5 AS calculated_fine
+    CASE
+        WHEN DATEDIFF(CURDATE(), i.due_date) <= p.grace_days THEN 0
+        WHEN p.cap IS NULL THEN (DATEDIFF(CURDATE(), i.due_date) - p.grace_days) * p.rate
+        WHEN (DATEDIFF(CURDATE(), i.due_date) - p.grace_days) * p.rate > p.cap THEN p.cap
+        ELSE (DATEDIFF(CURDATE(), i.due_date) - p.grace_days) * p.rate
+    END AS calculated_fine
 FROM issues i
 JOIN books b ON i.book_id = b.book_id
 JOIN students s ON i.student_id = s.student_id
+JOIN fine_policies p ON p.category = CASE
+    WHEN EXISTS (SELECT 1 FROM fine_policies c WHERE c.category = b.category) THEN b.category
+    ELSE 'default'
+END
 WHERE i.status = 'issued' AND i.due_date < CURDATE()
 ORDER BY days_overdue DESC;
 
@@ -396,6 +478,7 @@ END //
 DELIMITER ;
 
 -- Procedure: Calculate Fine
+-- Fine for a returned issue under its book category's fine_policies row
 DELIMITER //
 
 CREATE PROCEDURE CalculateFine(IN p_issue_id INT)
@@ -403,16 +486,27 @@ BEGIN
     DECLARE v_due_date DATE;
     DECLARE v_return_date DATE;
     DECLARE v_days_late INT;
+    DECLARE v_rate DECIMAL(10,2);
+    DECLARE v_grace_days INT;
+    DECLARE v_cap DECIMAL(10,2);
     DECLARE v_fine DECIMAL(10,2);
     
-    SELECT due_date, return_date 
-    INTO v_due_date, v_return_date
-    FROM issues 
-    WHERE issue_id = p_issue_id;
+    SELECT i.due_date, i.return_date, p.rate, p.grace_days, p.cap
+    INTO v_due_date, v_return_date, v_rate, v_grace_days, v_cap
+    FROM issues i
+    JOIN books b ON i.book_id = b.book_id
+    JOIN fine_policies p ON p.category = CASE
+        WHEN EXISTS (SELECT 1 FROM fine_policies c WHERE c.category = b.category) THEN b.category
+        ELSE 'default'
+    END
+    WHERE i.issue_id = p_issue_id;
     
-    IF v_return_date > v_due_date THEN
-        SET v_days_late = DATEDIFF(v_return_date, v_due_date);
-        SET v_fine = v_days_late * 5.00;
+    SET v_days_late = DATEDIFF(v_return_date, v_due_date);
+    IF v_days_late > v_grace_days THEN
+        SET v_fine = (v_days_late - v_grace_days) * v_rate;
+        IF v_cap IS NOT NULL AND v_fine > v_cap THEN
+            SET v_fine = v_cap;
+        END IF;
     ELSE
         SET v_fine = 0;
     END IF;
@@ -467,6 +561,7 @@ DELIMITER ;
 -- INDEX idx_author on books(author)
 -- INDEX idx_category on books(category)
 -- INDEX idx_isbn on books(isbn)
+-- FULLTEXT INDEX ft_books on books(title, author, category)
 -- INDEX idx_email on students(email)
 -- INDEX idx_name on students(name)
 -- INDEX idx_username on librarians(username)
@@ -475,6 +570,8 @@ DELIMITER ;
 -- INDEX idx_due_date on issues(due_date)
 -- INDEX idx_book_id on issues(book_id)
 -- INDEX idx_student_id on issues(student_id)
+-- INDEX idx_status_due on issues(status, due_date)
+-- INDEX idx_student_status on issues(student_id, status, due_date)
 
 -- ============================================================================
 -- Grant Permissions (Adjust as needed)
@@ -0,0 +1,128 @@
+"""
+Overdue Tracker
+In-memory view of open issues that answers "what is overdue today"
+without scanning the issues table
+"""
+
+import bisect
+import heapq
+import threading
+import time
+
+
+class OverdueTracker:
+    """Open issues split into those not yet due and those overdue
+
+    Issues not yet due sit in a min-heap on due date; as the date moves
+    on, ``_advance`` pops the ones that have fallen due into the overdue
+    map, so each issue is handled once, when it becomes overdue.  Returned
+    issues are dropped from the maps straight away and their heap entries
+    are skipped when they surface.
+
+    The tracker only sees this process's issues and returns, so the
+    owner reloads it from the database every so often (see ``is_stale``)
+    to pick up changes made at other desks.  Changes made while a reload
+    is reading the table are replayed over its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # (due_date, issue_id) for issues that were not overdue when pushed
+        self._heap = []
+        # issue_id -> due_date for every open issue, and for the overdue ones
+        self._open = {}
+        self._overdue = {}
+        self._today = None
+        # (due_date, issue_id) of the overdue issues in order, rebuilt on change
+        self._sorted = None
+        # add/remove calls made while a reload is in flight
+        self._changes = None
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._open)
+
+    def is_stale(self, max_age):
+        """True before the first load and once max_age seconds have passed"""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= max_age
+
+    def begin_reload(self):
+        """Start recording changes; call before reading the open issues"""
+        with self._lock:
+            self._changes = []
+
+    def load(self, open_issues):
+        """Replace the contents with (issue_id, due_date) pairs read since
+        begin_reload, then replay the changes made in the meantime"""
+        with self._lock:
+            changes, self._changes = self._changes or [], None
+            self._open = dict(open_issues)
+            for issue_id, due_date in changes:
+                if due_date is None:
+                    self._open.pop(issue_id, None)
+                else:
+                    self._open[issue_id] = due_date
+            self._heap = [(due_date, issue_id) for issue_id, due_date in self._open.items()]
+            heapq.heapify(self._heap)
+            self._overdue = {}
+            self._sorted = None
+            self._today = None
+            self.loaded_at = time.monotonic()
+
+    def add(self, issue_id, due_date):
+        """Track a newly issued book"""
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((issue_id, due_date))
+            if self.loaded_at is None:
+                return
+            self._open[issue_id] = due_date
+            if self._today is not None and due_date < self._today:
+                self._overdue[issue_id] = due_date
+                self._sorted = None
+            else:
+                heapq.heappush(self._heap, (due_date, issue_id))
+
+    def remove(self, issue_id):
+        """Forget a returned issue"""
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((issue_id, None))
+            self._open.pop(issue_id, None)
+            if self._overdue.pop(issue_id, None) is not None:
+                self._sorted = None
+
+    def _advance(self, today):
+        """Move every issue due before today into the overdue map"""
+        if today == self._today:
+            return
+        heap = self._heap
+        while heap and heap[0][0] < today:
+            due_date, issue_id = heapq.heappop(heap)
+            # Skip entries for issues returned (or reloaded) since the push
+            if self._open.get(issue_id) == due_date:
+                self._overdue[issue_id] = due_date
+                self._sorted = None
+        self._today = today
+
+    def overdue(self, today):
+        """(due_date, issue_id) of every overdue issue, most overdue first
+
+        The list is shared until the next change; do not modify it.
+        """
+        with self._lock:
+            self._advance(today)
+            if self._sorted is None:
+                self._sorted = sorted((due_date, issue_id) for issue_id, due_date in self._overdue.items())
+            return self._sorted
+
+    def page(self, today, after_date=None, after_id=None, limit=50):
+        """One page of overdue() starting after the (due_date, issue_id) keyset"""
+        overdue = self.overdue(today)
+        start = 0 if after_date is None else bisect.bisect_right(overdue, (after_date, after_id or 0))
+        return overdue[start:start + limit]
+
+    def overdue_count(self, today):
+        with self._lock:
+            self._advance(today)
+            return len(self._overdue)
@@ -1,110 +1,251 @@
-import tkinter as tk
-from tkinter import messagebox
-import bcrypt
-
-# ---------- FUNCTIONS ----------
-
-def generate_hash():
-    password = entry_password.get()
-
-    if password == "":
-        messagebox.showwarning("Warning", "Enter password first")
-        return
-
-    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-    hashed_str = hashed.decode()
-
-    text_hash.delete("1.0", tk.END)
-    text_hash.insert(tk.END, hashed_str)
-
-
-def copy_hash():
-    hash_value = text_hash.get("1.0", tk.END).strip()
-
-    if hash_value == "":
-        messagebox.showwarning("Warning", "No hash to copy")
-        return
-
-    root.clipboard_clear()
-    root.clipboard_append(hash_value)
-
-    messagebox.showinfo("Copied", "Hash copied to clipboard")
-
-
-def verify_password():
-    password = entry_verify_password.get()
-    hash_value = entry_verify_hash.get()
-
-    if password == "" or hash_value == "":
-        messagebox.showwarning("Warning", "Enter password and hash")
-        return
-
-    try:
-        if bcrypt.checkpw(password.encode(), hash_value.encode()):
-            label_result.config(text="✔ Password MATCHES hash", fg="#00ff9c")
-        else:
-            label_result.config(text="✖ Password DOES NOT match", fg="#ff4d4d")
-
-    except:
-        messagebox.showerror("Error", "Invalid hash format")
-
-
-# ---------- DARK THEME COLORS ----------
-
-bg = "#1e1e1e"
-fg = "#ffffff"
-entry_bg = "#2d2d2d"
-btn_green = "#00c853"
-btn_blue = "#2962ff"
-btn_purple = "#aa00ff"
-
-# ---------- WINDOW ----------
-
-root = tk.Tk()
-root.title("Password Hash Generator - Dark Theme")
-root.geometry("600x500")
-root.configure(bg=bg)
-root.resizable(False, False)
-
-# ---------- TITLE ----------
-
-title = tk.Label(root, text="Password Hash Generator", font=("Arial", 18, "bold"), bg=bg, fg=fg)
-title.pack(pady=10)
-
-# ---------- GENERATE HASH ----------
-
-tk.Label(root, text="Enter Password:", bg=bg, fg=fg).pack()
-
-entry_password = tk.Entry(root, width=40, bg=entry_bg, fg=fg, insertbackground=fg)
-entry_password.pack(pady=5)
-
-btn_generate = tk.Button(root, text="Generate Hash", command=generate_hash, bg=btn_green, fg="white", width=20)
-btn_generate.pack(pady=5)
-
-text_hash = tk.Text(root, height=3, width=60, bg=entry_bg, fg=fg, insertbackground=fg)
-text_hash.pack(pady=5)
-
-btn_copy = tk.Button(root, text="Copy Hash", command=copy_hash, bg=btn_blue, fg="white", width=20)
-btn_copy.pack(pady=5)
-
-# ---------- VERIFY SECTION ----------
-
-tk.Label(root, text="Verify Password", font=("Arial", 14, "bold"), bg=bg, fg=fg).pack(pady=10)
-
-tk.Label(root, text="Enter Password:", bg=bg, fg=fg).pack()
-entry_verify_password = tk.Entry(root, width=40, bg=entry_bg, fg=fg, insertbackground=fg)
-entry_verify_password.pack(pady=5)
-
-tk.Label(root, text="Enter Hash:", bg=bg, fg=fg).pack()
-entry_verify_hash = tk.Entry(root, width=60, bg=entry_bg, fg=fg, insertbackground=fg)
-entry_verify_hash.pack(pady=5)
-
-btn_verify = tk.Button(root, text="Verify Password", command=verify_password, bg=btn_purple, fg="white", width=20)
-btn_verify.pack(pady=10)
-
-label_result = tk.Label(root, text="", bg=bg, fg=fg, font=("Arial", 12, "bold"))
-label_result.pack()
-
-# ---------- RUN ----------
-
-root.mainloop()
+"""
+Password Hash Generator
+Dark-themed window for generating and checking bcrypt hashes. With
+--migrate it runs headless instead and converts every librarian still on
+an old SHA-256 hash to bcrypt, hashing across worker processes.
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import tkinter as tk
+from tkinter import messagebox
+import bcrypt
+
+from credentials import is_sha256_digest, wrap_legacy_hash
+
+# ---------- FUNCTIONS ----------
+
+def generate_hash():
+    password = entry_password.get()
+
+    if password == "":
+        messagebox.showwarning("Warning", "Enter password first")
+        return
+
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    hashed_str = hashed.decode()
+
+    text_hash.delete("1.0", tk.END)
+    text_hash.insert(tk.END, hashed_str)
+
+
+def copy_hash():
+    hash_value = text_hash.get("1.0", tk.END).strip()
+
+    if hash_value == "":
+        messagebox.showwarning("Warning", "No hash to copy")
+        return
+
+    root.clipboard_clear()
+    root.clipboard_append(hash_value)
+
+    messagebox.showinfo("Copied", "Hash copied to clipboard")
+
+
+def verify_password():
+    password = entry_verify_password.get()
+    hash_value = entry_verify_hash.get()
+
+    if password == "" or hash_value == "":
+        messagebox.showwarning("Warning", "Enter password and hash")
+        return
+
+    try:
+        if bcrypt.checkpw(password.encode(), hash_value.encode()):
+            label_result.config(text="✔ Password MATCHES hash", fg="#00ff9c")
+        else:
+            label_result.config(text="✖ Password DOES NOT match", fg="#ff4d4d")
+
+    except:
+        messagebox.showerror("Error", "Invalid hash format")
+
+
+# ---------- DARK THEME COLORS ----------
+
+bg = "#1e1e1e"
+fg = "#ffffff"
+entry_bg = "#2d2d2d"
+btn_green = "#00c853"
+btn_blue = "#2962ff"
+btn_purple = "#aa00ff"
+
+# ---------- BATCH MIGRATION ----------
+
+def wrap_batch(rows, rounds):
+    """Wrap one batch of (librarian_id, digest) in bcrypt; runs in a worker process"""
+    return [(wrap_legacy_hash(digest, rounds), librarian_id, digest) for librarian_id, digest in rows]
+
+
+def legacy_batches(db, batch_size):
+    """Librarians still on a bare SHA-256 digest, up to batch_size at a time by ID"""
+    after_id = 0
+    while True:
+        with db.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT librarian_id, password FROM librarians
+                WHERE librarian_id > %s
+                ORDER BY librarian_id LIMIT %s
+            """, (after_id, batch_size))
+            rows = cursor.fetchall()
+            cursor.close()
+        if not rows:
+            return
+        after_id = rows[-1][0]
+        batch = [(librarian_id, stored) for librarian_id, stored in rows if is_sha256_digest(stored)]
+        if batch:
+            yield batch
+
+
+def write_batch(db, rows):
+    """Store one batch of wrapped hashes in a single transaction
+
+    Each row is only updated if it still holds the digest that was
+    wrapped, so a password changed or upgraded at login meanwhile is kept.
+    Returns how many rows were updated.
+    """
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            UPDATE librarians SET password = %s
+            WHERE librarian_id = %s AND password = %s
+        """, rows)
+        updated = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        return updated
+
+
+def migrate(dsn=None, rounds=None, workers=None, batch_size=64, report_every=1000):
+    """Wrap every librarian's SHA-256 digest in bcrypt, across worker processes
+
+    The plain passwords are unknown, so each digest is hashed as it is
+    (see credentials.wrap_legacy_hash); the next successful login replaces
+    it with a bcrypt hash of the password itself.
+    """
+    # Only the migration needs the database; the window runs on bcrypt alone
+    from library_management_system import BCRYPT_ROUNDS, DatabaseManager
+
+    print("=" * 60)
+    print("Library Management System - Password Migration")
+    print("=" * 60)
+    print()
+
+    db = DatabaseManager(pool_size=1, backend=dsn)
+    if not db.pool:
+        print("❌ Could not connect to the database")
+        return False
+
+    rounds = rounds or BCRYPT_ROUNDS
+    workers = workers or os.cpu_count()
+    start = time.perf_counter()
+    hashed = updated = 0
+
+    def collect(future):
+        nonlocal hashed, updated
+        rows = future.result()
+        updated += write_batch(db, rows)
+        if (hashed + len(rows)) // report_every > hashed // report_every:
+            rate = (hashed + len(rows)) / (time.perf_counter() - start)
+            print(f"  {hashed + len(rows):>10,} hashed  {rate:>8,.1f} hashes/s")
+        hashed += len(rows)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Two batches per worker in flight keeps every core busy while the
+        # previous results are written
+        pending = deque()
+        for batch in legacy_batches(db, batch_size):
+            pending.append(pool.submit(wrap_batch, batch, rounds))
+            if len(pending) >= workers * 2:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    db.pool.close()
+    elapsed = time.perf_counter() - start
+    rate = hashed / elapsed if elapsed else 0.0
+
+    print(f"{'Accounts hashed':<24} {hashed:>12,}")
+    print(f"{'Accounts updated':<24} {updated:>12,}")
+    print(f"{'Changed meanwhile':<24} {hashed - updated:>12,}")
+    print(f"{'bcrypt cost':<24} {rounds:>12}")
+    print(f"{'Workers':<24} {workers:>12}")
+    print(f"{'Time':<24} {elapsed:>11.1f}s ({rate:,.1f} hashes/s, "
+          f"{rate / min(workers, os.cpu_count()):,.1f} per core)")
+    print()
+    print("✓ Migration complete")
+    return True
+
+
+# ---------- WINDOW ----------
+
+def run_gui():
+    global root, text_hash, entry_password, entry_verify_password, entry_verify_hash, label_result
+
+    root = tk.Tk()
+    root.title("Password Hash Generator - Dark Theme")
+    root.geometry("600x500")
+    root.configure(bg=bg)
+    root.resizable(False, False)
+
+    # ---------- TITLE ----------
+
+    title = tk.Label(root, text="Password Hash Generator", font=("Arial", 18, "bold"), bg=bg, fg=fg)
+    title.pack(pady=10)
+
+    # ---------- GENERATE HASH ----------
+
+    tk.Label(root, text="Enter Password:", bg=bg, fg=fg).pack()
+
+    entry_password = tk.Entry(root, width=40, bg=entry_bg, fg=fg, insertbackground=fg)
+    entry_password.pack(pady=5)
+
+    btn_generate = tk.Button(root, text="Generate Hash", command=generate_hash, bg=btn_green, fg="white", width=20)
+    btn_generate.pack(pady=5)
+
+    text_hash = tk.Text(root, height=3, width=60, bg=entry_bg, fg=fg, insertbackground=fg)
+    text_hash.pack(pady=5)
+
+    btn_copy = tk.Button(root, text="Copy Hash", command=copy_hash, bg=btn_blue, fg="white", width=20)
+    btn_copy.pack(pady=5)
+
+    # ---------- VERIFY SECTION ----------
+
+    tk.Label(root, text="Verify Password", font=("Arial", 14, "bold"), bg=bg, fg=fg).pack(pady=10)
+
+    tk.Label(root, text="Enter Password:", bg=bg, fg=fg).pack()
+    entry_verify_password = tk.Entry(root, width=40, bg=entry_bg, fg=fg, insertbackground=fg)
+    entry_verify_password.pack(pady=5)
+
+    tk.Label(root, text="Enter Hash:", bg=bg, fg=fg).pack()
+    entry_verify_hash = tk.Entry(root, width=60, bg=entry_bg, fg=fg, insertbackground=fg)
+    entry_verify_hash.pack(pady=5)
+
+    btn_verify = tk.Button(root, text="Verify Password", command=verify_password, bg=btn_purple, fg="white", width=20)
+    btn_verify.pack(pady=10)
+
+    label_result = tk.Label(root, text="", bg=bg, fg=fg, font=("Arial", 12, "bold"))
+    label_result.pack()
+
+    root.mainloop()
+
+
+# ---------- RUN ----------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate and verify bcrypt password hashes")
+    parser.add_argument('--migrate', action='store_true',
+                        help="convert every librarian's SHA-256 hash to bcrypt, without the window")
+    parser.add_argument('--db', help="database DSN for --migrate (default DB_BACKEND settings)")
+    parser.add_argument('--rounds', type=int, help="bcrypt cost factor (default BCRYPT_ROUNDS)")
+    parser.add_argument('--workers', type=int, help="worker processes (default one per CPU)")
+    parser.add_argument('--batch-size', type=int, default=64, help="accounts per UPDATE transaction")
+    args = parser.parse_args()
+    if args.migrate:
+        migrate(args.db, rounds=args.rounds, workers=args.workers, batch_size=args.batch_size)
+    else:
+        run_gui()
@@ -0,0 +1,90 @@
+"""
+QR Code Pre-generation Script
+Renders every student's QR codes (history dialog and student dashboard)
+into the QR cache directory, so no window has to encode one on first
+open. Codes already in the directory are skipped, so re-running it after
+adding students only renders the new ones.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import library_management_system as lms
+from qr_cache import QRCodeCache
+
+PAGE_SIZE = 500
+
+
+def _use_directory(directory):
+    # Workers only fill the directory; nothing is kept in memory
+    lms.qr_codes = QRCodeCache(max_entries=0, directory=directory)
+
+
+def _render_page(students):
+    """Render one page of students; returns (codes rendered, codes already on disk)"""
+    stats = lms.qr_codes.stats
+    renders, disk_hits = stats['renders'], stats['disk_hits']
+    for student in students:
+        lms.history_qr_image(student['student_id'])
+        lms.dashboard_qr_image(student)
+    return stats['renders'] - renders, stats['disk_hits'] - disk_hits
+
+
+def pregenerate_qr(directory=lms.QR_CACHE_DIR, workers=None):
+    """Render missing QR codes for all students and print the throughput"""
+
+    print("=" * 60)
+    print("Library Management System - QR Code Pre-generation")
+    print("=" * 60)
+    print()
+
+    if not directory:
+        print("❌ No cache directory: set QR_CACHE_DIR or pass --dir")
+        return False
+
+    db = lms.DatabaseManager(pool_size=1)
+    if not db.pool:
+        print("❌ Could not connect to the database")
+        return False
+
+    start = time.perf_counter()
+    students = rendered = cached = 0
+
+    # QR encoding is CPU-bound pure Python, so pages go to worker processes
+    with ProcessPoolExecutor(max_workers=workers, initializer=_use_directory, initargs=(directory,)) as pool:
+        futures = {}
+        after_name = after_id = None
+        while True:
+            page = db.get_students_page(after_name, after_id, limit=PAGE_SIZE)
+            if not page:
+                break
+            rows = [{'student_id': row['student_id']} for row in page]
+            futures[pool.submit(_render_page, rows)] = len(rows)
+            after_name, after_id = page[-1]['name'], page[-1]['student_id']
+
+        for future in as_completed(futures):
+            page_rendered, page_cached = future.result()
+            students += futures[future]
+            rendered += page_rendered
+            cached += page_cached
+
+    db.pool.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Students':<24} {students:>12,}")
+    print(f"{'Codes rendered':<24} {rendered:>12,}")
+    print(f"{'Already cached':<24} {cached:>12,}")
+    print(f"{'Time':<24} {elapsed:>11.1f}s ({rendered / elapsed:,.0f} codes/s)")
+    print()
+    print(f"✓ QR codes saved in {os.path.abspath(directory)}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every student's QR codes into the QR cache directory")
+    parser.add_argument('--dir', default=lms.QR_CACHE_DIR, help="cache directory (default QR_CACHE_DIR)")
+    parser.add_argument('--workers', type=int, help="worker processes (default one per CPU)")
+    args = parser.parse_args()
+    pregenerate_qr(directory=args.dir, workers=args.workers)
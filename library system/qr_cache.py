@@ -0,0 +1,125 @@
+"""
+QR Code Cache
+Student QR codes encoded once and kept as PNG bytes, so reopening a
+student's window decodes a small PNG instead of re-encoding the QR
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import qrcode
+from PIL import Image
+
+
+def qr_image(payload, box_size=10, border=4, fill_color='black', back_color='white', size=None):
+    """Encode payload as a QR code and return it as a PIL image"""
+    qr = qrcode.QRCode(version=1, box_size=box_size, border=border)
+    qr.add_data(payload)
+    qr.make(fit=True)
+
+    image = qr.make_image(fill_color=fill_color, back_color=back_color).get_image()
+    if size is not None:
+        image = image.resize((size, size))
+    return image
+
+
+def render_qr(payload, box_size=10, border=4, fill_color='black', back_color='white', size=None):
+    """Encode payload as a QR code and return it as PNG bytes"""
+    image = qr_image(payload, box_size, border, fill_color, back_color, size)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class QRCodeCache:
+    """Least-recently-used cache of rendered QR codes
+
+    Entries are keyed by student ID together with the payload and every
+    render parameter, so a changed name or e-mail, or a different size or
+    colour, is a different entry.  Memory is bounded both by max_entries
+    and by max_bytes of PNG data; the least recently used codes go first.
+
+    With a directory, every rendered code is also written there and looked
+    up on a memory miss, so codes survive restarts and can be generated in
+    bulk ahead of time (see pregenerate_qr.py).
+    """
+
+    def __init__(self, max_entries=512, max_bytes=16 * 1024 * 1024, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'renders': 0, 'evictions': 0}
+
+    def _path(self, key):
+        # The student ID leads the file name so one student's codes are
+        # easy to find and delete; the digest covers everything else
+        digest = hashlib.sha1(repr(key[1:]).encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.directory, f"{key[0]}-{digest}.png")
+
+    def _store(self, key, png):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = png
+            self._bytes += len(png)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats['evictions'] += 1
+
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, png):
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Write then rename, so a reader never sees half a file
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, 'wb') as f:
+            f.write(png)
+        os.replace(temp, path)
+
+    def png(self, student_id, payload, box_size=10, border=4, fill_color='black', back_color='white', size=None):
+        """PNG bytes of a student's QR code, rendered only on a full miss"""
+        key = (student_id, payload, box_size, border, fill_color, back_color, size)
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return png
+
+        png = self._read_disk(key)
+        if png is not None:
+            self.stats['disk_hits'] += 1
+        else:
+            png = render_qr(payload, box_size, border, fill_color, back_color, size)
+            self.stats['renders'] += 1
+            self._write_disk(key, png)
+        self._store(key, png)
+        return png
+
+    def image(self, student_id, payload, **params):
+        """The QR code as a PIL image, ready for ImageTk.PhotoImage"""
+        return Image.open(io.BytesIO(self.png(student_id, payload, **params)))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
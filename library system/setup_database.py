@@ -5,7 +5,9 @@ Run this script to initialize the database and test the connection
 
 import mysql.connector
 from mysql.connector import Error
-import hashlib
+
+from credentials import hash_password
+from library_management_system import BCRYPT_ROUNDS
 
 def setup_database():
     """Setup database and tables"""
@@ -103,8 +105,21 @@ def setup_database():
             """)
             print("✓ Issues table created")
             
+            # Create Library Counters table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS library_counters (
+                    counter_id INT PRIMARY KEY,
+                    total_books INT NOT NULL DEFAULT 0,
+                    total_copies INT NOT NULL DEFAULT 0,
+                    available_books INT NOT NULL DEFAULT 0,
+                    total_students INT NOT NULL DEFAULT 0,
+                    issued_books INT NOT NULL DEFAULT 0
+                )
+            """)
+            print("✓ Library counters table created")
+            
             # Create default admin
-            password_hash = hashlib.sha256("admin123".encode()).hexdigest()
+            password_hash = hash_password("admin123", BCRYPT_ROUNDS)
             try:
                 cursor.execute("""
                     INSERT INTO librarians (username, password, full_name, role)
@@ -160,6 +175,21 @@ def setup_database():
             connection.commit()
             print("✓ Sample students added")
             
+            # Rebuild counters so they include the sample data
+            cursor.execute("""
+                REPLACE INTO library_counters
+                    (counter_id, total_books, total_copies, available_books,
+                     total_students, issued_books)
+                SELECT 1,
+                    (SELECT COUNT(*) FROM books),
+                    (SELECT COALESCE(SUM(quantity), 0) FROM books),
+                    (SELECT COALESCE(SUM(available), 0) FROM books),
+                    (SELECT COUNT(*) FROM students),
+                    (SELECT COUNT(*) FROM issues WHERE status = 'issued')
+            """)
+            connection.commit()
+            print("✓ Library counters rebuilt")
+            
             print("\n" + "=" * 60)
             print("Database setup completed successfully!")
             print("=" * 60)
@@ -0,0 +1,107 @@
+"""
+Statement Cache
+Server-side prepared statements for DatabaseManager's hot queries,
+prepared once per pooled connection and reused on every later call
+"""
+
+import threading
+
+from mysql.connector import Error
+
+# MySQL forgets prepared statements when a connection is re-established
+# (the pool's health check reconnects in place)
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+
+class StatementCache:
+    """Named statements kept prepared on each connection that runs them
+
+    Every connection gets its own prepared cursor per statement name,
+    stored on the connection object so it lives and dies with it.  A
+    pooled connection is only used by one thread at a time, so the
+    per-connection cursors need no locking; only the hit counters are
+    shared.  With ``enabled=False`` each call uses a fresh cursor, which
+    is how the queries ran before.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # name -> {'prepares': n, 'hits': n}
+        self.stats = {}
+
+    def _count(self, name, key):
+        with self._lock:
+            counts = self.stats.setdefault(name, {'prepares': 0, 'hits': 0})
+            counts[key] += 1
+
+    def _cursor(self, conn, name, sql):
+        """The connection's prepared cursor for name, and the SQL it holds"""
+        cursors = getattr(conn, '_prepared_statements', None)
+        if cursors is None:
+            cursors = conn._prepared_statements = {}
+        entry = cursors.get(name)
+        if entry is None:
+            # The prepared cursor only re-prepares when handed a different
+            # string object, so keep the one it was prepared with
+            entry = cursors[name] = (conn.cursor(prepared=True), sql)
+            self._count(name, 'prepares')
+        else:
+            self._count(name, 'hits')
+        return entry
+
+    def _drop(self, conn, name):
+        cursor, _ = conn._prepared_statements.pop(name)
+        try:
+            cursor.close()
+        except Error:
+            pass
+
+    def _run(self, conn, name, sql, params, result):
+        if not self.enabled:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                return result(cursor)
+            finally:
+                cursor.close()
+
+        cursor, sql = self._cursor(conn, name, sql)
+        try:
+            cursor.execute(sql, params)
+        except Error as e:
+            self._drop(conn, name)
+            if e.errno != ER_UNKNOWN_STMT_HANDLER:
+                raise
+            cursor, sql = self._cursor(conn, name, sql)
+            cursor.execute(sql, params)
+        # Results are always read in full: a prepared cursor cannot run
+        # again while rows are still pending
+        return result(cursor)
+
+    def execute(self, conn, name, sql, params=()):
+        """Run a statement that returns no rows and return its row count"""
+        return self._run(conn, name, sql, params, lambda cursor: cursor.rowcount)
+
+    def insert(self, conn, name, sql, params=()):
+        """Run an INSERT and return the id of the new row"""
+        return self._run(conn, name, sql, params, lambda cursor: cursor.lastrowid)
+
+    def fetchall(self, conn, name, sql, params=(), dictionary=False):
+        """Run a query and return every row, as dicts if asked"""
+        rows, description = self._run(conn, name, sql, params,
+                                      lambda cursor: (cursor.fetchall(), cursor.description))
+        if dictionary:
+            columns = [d[0] for d in description]
+            return [dict(zip(columns, row)) for row in rows]
+        return rows
+
+    def fetchone(self, conn, name, sql, params=(), dictionary=False):
+        """Run a query expected to match at most one row"""
+        rows = self.fetchall(conn, name, sql, params, dictionary)
+        return rows[0] if rows else None
+
+    def summary(self):
+        """Copy of the per-statement counters, sorted by name"""
+        with self._lock:
+            return {name: dict(counts) for name, counts in sorted(self.stats.items())}
@@ -0,0 +1,134 @@
+"""
+Student Cards
+Printable library cards carrying the student's QR code, rendered as
+images, and a PDF writer that streams them out one page per card
+"""
+
+import functools
+import io
+import zlib
+
+from PIL import Image, ImageDraw, ImageFont
+
+from qr_cache import qr_image
+
+# ID-1 (credit card) size at 300 dpi, and in PDF points
+CARD_SIZE = (1012, 638)
+CARD_POINTS = (243, 153)
+
+# Same colours as the application's COLORS
+PRIMARY = '#2C3E50'
+SECONDARY = '#3498DB'
+TEXT_LIGHT = '#7F8C8D'
+
+
+@functools.lru_cache(maxsize=None)
+def _font(size, bold=False):
+    # Segoe UI as in the application, else DejaVu, else Pillow's own font
+    names = ('segoeuib.ttf', 'DejaVuSans-Bold.ttf') if bold else ('segoeui.ttf', 'DejaVuSans.ttf')
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size=size)
+
+
+def _fit(draw, text, font, width):
+    """text, shortened with an ellipsis until it fits in width pixels"""
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(text + '…', font=font) > width:
+        text = text[:-1]
+    return text + '…'
+
+
+def render_card(student, payload):
+    """A student's library card as an RGB image of CARD_SIZE
+
+    student needs 'student_id', 'name' and 'email'; 'registration_date'
+    is printed when present. payload is what the QR code carries, the
+    signed student payload also shown on the dashboard.
+    """
+    width, height = CARD_SIZE
+    card = Image.new('RGB', CARD_SIZE, 'white')
+    draw = ImageDraw.Draw(card)
+
+    draw.rectangle((0, 0, width, 130), fill=PRIMARY)
+    draw.text((50, 30), "LIBRARY CARD", font=_font(54, bold=True), fill='white')
+    draw.rectangle((0, height - 24, width, height), fill=SECONDARY)
+
+    qr = qr_image(payload, box_size=10, border=2, fill_color=PRIMARY, size=380)
+    card.paste(qr, (width - 380 - 40, 170))
+
+    text_width = width - 380 - 40 - 50 - 30
+    draw.text((50, 190), _fit(draw, student['name'], _font(50, bold=True), text_width),
+              font=_font(50, bold=True), fill=PRIMARY)
+    draw.text((50, 275), f"ID {student['student_id']:06d}", font=_font(40), fill=PRIMARY)
+    draw.text((50, 345), _fit(draw, student['email'], _font(30), text_width), font=_font(30), fill=TEXT_LIGHT)
+    registered = student.get('registration_date')
+    if registered:
+        draw.text((50, 520), f"Member since {str(registered)[:10]}", font=_font(28), fill=TEXT_LIGHT)
+    return card
+
+
+def card_jpeg(student, payload, quality=90):
+    """render_card as JPEG bytes, the form CardPdfWriter embeds"""
+    buffer = io.BytesIO()
+    render_card(student, payload).save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+class CardPdfWriter:
+    """Multi-page PDF with one card-sized page per JPEG card image
+
+    Pages are written to the file as they are added, so memory stays flat
+    however many cards there are; only the page object numbers are kept
+    until close() writes the page tree and cross-reference table.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'wb')
+        self._offsets = {}
+        self._pages = []
+        # 1 is the catalog and 2 the page tree, written last
+        self._next = 3
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _object(self, number, body, stream=None):
+        self._offsets[number] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % number + body)
+        if stream is not None:
+            self._file.write(b"\nstream\n" + stream + b"\nendstream")
+        self._file.write(b"\nendobj\n")
+
+    def add_page(self, jpeg):
+        width, height = CARD_SIZE
+        page_width, page_height = CARD_POINTS
+        image, contents, page = self._next, self._next + 1, self._next + 2
+        self._next += 3
+
+        self._object(image, b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                            b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>" % (width, height, len(jpeg)),
+                     jpeg)
+        drawing = zlib.compress(b"q %d 0 0 %d 0 0 cm /Card Do Q" % (page_width, page_height))
+        self._object(contents, b"<< /Filter /FlateDecode /Length %d >>" % len(drawing), drawing)
+        self._object(page, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                           b"/Resources << /XObject << /Card %d 0 R >> >> >>"
+                           % (page_width, page_height, contents, image))
+        self._pages.append(page)
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % page for page in self._pages)
+        self._object(2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._pages))
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref = self._file.tell()
+        self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next)
+        for number in range(1, self._next):
+            self._file.write(b"%010d 00000 n \n" % self._offsets[number])
+        self._file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self._next, xref))
+        self._file.close()
+
+    def __len__(self):
+        return len(self._pages)
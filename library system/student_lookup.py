@@ -0,0 +1,80 @@
+"""
+Student Lookup
+Resolves scanned student QR payloads to the student and the books they
+have out, with student records kept in an in-memory LRU cache
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from qr_payload import decode_payload
+
+
+class StudentLookup:
+    """Scanned payload -> student record and open issues
+
+    The signature is checked locally, so a forged or foreign code never
+    reaches the database. Student records change rarely and are cached,
+    least recently used first out, for at most max_age seconds so edits
+    made elsewhere show up; open issues change with every checkout and
+    return, so they are read fresh on each scan.
+    """
+
+    def __init__(self, db, key, max_students=10000, max_age=300):
+        self.db = db
+        self.key = key
+        self.max_students = max_students
+        self.max_age = max_age
+        # student_id -> (record, loaded at)
+        self._students = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def student(self, student_id):
+        """A student's record, from the cache if fresh; None if there is no such student"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._students.get(student_id)
+            if cached is not None and now - cached[1] < self.max_age:
+                self._students.move_to_end(student_id)
+                self.stats['hits'] += 1
+                return cached[0]
+            self.stats['misses'] += 1
+
+        record = self.db.get_student(student_id)
+        if record is not None:
+            with self._lock:
+                self._students[student_id] = (record, now)
+                self._students.move_to_end(student_id)
+                while len(self._students) > self.max_students:
+                    self._students.popitem(last=False)
+        return record
+
+    def lookup(self, payload, today=None):
+        """The student and open issues for a scanned payload
+
+        Returns {'student', 'issues', 'overdue', 'fines'}, each issue with
+        its days overdue and fine so far, or None if the student no longer
+        exists. Raises InvalidPayload for codes that are not ours.
+        """
+        student_id = decode_payload(payload, self.key)
+        student = self.student(student_id)
+        if student is None:
+            return None
+
+        today = today or date.today()
+        issues = self.db.get_open_issues(student_id)
+        for issue in issues:
+            issue['days_overdue'] = max((today - issue['due_date']).days, 0)
+            issue['fine'] = self.db.fines.fine(issue['due_date'], today, issue['category'])
+        return {
+            'student': student,
+            'issues': issues,
+            'overdue': sum(1 for issue in issues if issue['days_overdue']),
+            'fines': sum(issue['fine'] for issue in issues),
+        }
+
+    def __len__(self):
+        return len(self._students)
@@ -0,0 +1,125 @@
+"""
+Task Executor
+Runs database calls on worker threads and hands their results back to the
+Tk event loop, so slow queries never freeze the GUI
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Task:
+    """Handle for a submitted call; cancel() drops its result"""
+
+    def __init__(self, on_done, on_error, keep=False):
+        self.on_done = on_done
+        self.on_error = on_error
+        self.keep = keep
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        """Skip the call if it has not started, and never deliver its result"""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class TaskExecutor:
+    """Thread pool whose results are delivered on the Tk thread
+
+    Tk widgets may only be touched from the thread running mainloop, so
+    workers put finished results on a queue and the Tk thread drains it
+    with root.after while any task is outstanding. Callbacks therefore run
+    on the Tk thread and may update widgets freely.
+    """
+
+    def __init__(self, root, workers=4, poll_interval=20):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='db-worker')
+        self._results = queue.Queue()
+        self._pending = set()
+        self._poll_job = None
+        self._closed = False
+
+    def submit(self, func, *args, on_done=None, on_error=None, keep=False, **kwargs):
+        """Run func(*args, **kwargs) in the background
+
+        on_done(result) or on_error(exception) is called on the Tk thread
+        unless the task is cancelled first. Without on_error, failures are
+        reported like any other Tk callback exception. With keep=True the
+        task survives cancel_all(), for work the user started and expects
+        to hear back about after leaving the screen; only shutdown() drops it.
+        """
+        if self._closed:
+            raise RuntimeError("TaskExecutor has been shut down")
+
+        task = Task(on_done, on_error, keep)
+        task.future = self._pool.submit(self._run, task, func, args, kwargs)
+        self._pending.add(task)
+        self._schedule_poll()
+        return task
+
+    def _run(self, task, func, args, kwargs):
+        if task.cancelled:
+            return
+        try:
+            self._results.put((task, func(*args, **kwargs), None))
+        except Exception as e:
+            self._results.put((task, None, e))
+
+    def _schedule_poll(self):
+        if self._poll_job is None and not self._closed:
+            self._poll_job = self.root.after(self.poll_interval, self._drain)
+
+    def _drain(self):
+        """Deliver finished results; runs on the Tk thread"""
+        self._poll_job = None
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(task)
+            if task.cancelled or self._closed:
+                continue
+            try:
+                if error is None:
+                    if task.on_done is not None:
+                        task.on_done(result)
+                elif task.on_error is not None:
+                    task.on_error(error)
+                else:
+                    raise error
+            except Exception as e:
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+        # Cancelled tasks that never ran leave nothing on the queue
+        self._pending = {task for task in self._pending if not task.future.cancelled()}
+        if self._pending:
+            self._schedule_poll()
+
+    def cancel_all(self, keep=True):
+        """Cancel every outstanding task, e.g. when the screen changes
+
+        Tasks submitted with keep=True carry on unless keep is False.
+        """
+        for task in self._pending:
+            if not (keep and task.keep):
+                task.cancel()
+        self._pending = {task for task in self._pending if not task.cancelled}
+
+    @property
+    def pending(self):
+        """Number of tasks whose results have not been delivered"""
+        return len(self._pending)
+
+    def shutdown(self):
+        """Cancel outstanding work and stop the worker threads"""
+        self.cancel_all(keep=False)
+        self._closed = True
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._pool.shutdown(wait=False)
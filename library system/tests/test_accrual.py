@@ -0,0 +1,111 @@
+"""
+Fine Accrual Tests
+DatabaseManager.accrue_fines resuming from its fine_accrual_runs
+checkpoint, on a SQLite file
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_management_system import DatabaseManager
+
+AS_OF = date.today() + timedelta(days=30)
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(pool_size=1, backend=f"sqlite:///{tmp_path / 'accrual.db'}",
+                         fine_policies={'default': {'rate': 1}})
+    db.add_book("Book", "Author", "ISBN-1", "Fiction", 20)
+    db.add_student("Student", "student@example.com", "0000000000", "Main Street")
+    for days in range(10):
+        assert db.issue_book(1, 1, days=days)[0]
+    yield db
+    db.pool.close()
+
+
+def fines(db):
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT issue_id, fine FROM issues ORDER BY issue_id")
+        rows = cursor.fetchall()
+        cursor.close()
+    return [(issue_id, float(fine)) for issue_id, fine in rows]
+
+
+def checkpoint(db, run_date=AS_OF):
+    with db.pool.connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT last_issue_id, rows_scanned, rows_updated, finished_at
+            FROM fine_accrual_runs WHERE run_date = %s
+        """, (run_date,))
+        row = cursor.fetchone()
+        cursor.close()
+    return row
+
+
+def expected(issue_ids):
+    """$1 a day for the issues due 30, 29, ... days before AS_OF"""
+    return [(issue_id, 30.0 - n) for n, issue_id in enumerate(issue_ids)]
+
+
+def test_interrupted_run_resumes_after_its_last_batch(db):
+    ids = [issue_id for issue_id, _ in fines(db)]
+
+    def crash(scanned):
+        raise Interrupted()
+
+    # Dies right after the first batch commits
+    with pytest.raises(Interrupted):
+        db.accrue_fines(as_of=AS_OF, batch_size=4, progress=crash)
+    assert fines(db) == expected(ids[:4]) + [(issue_id, 0.0) for issue_id in ids[4:]]
+    run = checkpoint(db)
+    assert (run['last_issue_id'], run['rows_scanned'], run['rows_updated'], run['finished_at']) == (ids[3], 4, 4, None)
+
+    summary = db.accrue_fines(as_of=AS_OF, batch_size=4)
+    assert summary == {'scanned': 10, 'updated': 10, 'resumed_from': ids[3], 'finished': True}
+    assert fines(db) == expected(ids)
+    run = checkpoint(db)
+    assert (run['last_issue_id'], run['rows_scanned'], run['rows_updated']) == (ids[-1], 10, 10)
+    assert run['finished_at'] is not None
+
+
+def test_max_batches_stops_early(db):
+    summary = db.accrue_fines(as_of=AS_OF, batch_size=3, max_batches=2)
+    assert summary['scanned'] == 6 and not summary['finished']
+    assert checkpoint(db)['rows_scanned'] == 6
+    assert db.accrue_fines(as_of=AS_OF, batch_size=3)['scanned'] == 10
+
+
+def test_finished_date_is_a_no_op(db):
+    first = db.accrue_fines(as_of=AS_OF, batch_size=4)
+    assert first['finished']
+    finished_at = checkpoint(db)['finished_at']
+
+    # A fine changed since (by hand, or a return) is left alone
+    ids = [issue_id for issue_id, _ in fines(db)]
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE issues SET fine = %s WHERE issue_id = %s", (Decimal('0'), ids[0]))
+        conn.commit()
+        cursor.close()
+    before = fines(db)
+    assert db.accrue_fines(as_of=AS_OF, batch_size=4) == {**first, 'resumed_from': ids[-1]}
+    assert fines(db) == before
+    assert checkpoint(db)['finished_at'] == finished_at
+
+    # The next day is a fresh run, which only rewrites the fines that moved
+    summary = db.accrue_fines(as_of=AS_OF + timedelta(days=1), batch_size=4)
+    assert summary == {'scanned': 10, 'updated': 10, 'resumed_from': 0, 'finished': True}
+    assert [fine for _, fine in fines(db)] == [31.0 - n for n in range(10)]
@@ -0,0 +1,126 @@
+"""
+Async Database Manager Tests
+AsyncDatabaseManager against DatabaseManager on one SQLite file: the same
+results method by method, and no copy oversold when thousands of
+coroutines issue the same book at once
+"""
+
+import asyncio
+import os
+import random
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_db import AsyncDatabaseManager
+from library_management_system import DatabaseManager
+
+BOOKS = 300
+STUDENTS = 100
+
+
+@pytest.fixture
+def dsn(tmp_path):
+    dsn = f"sqlite:///{tmp_path / 'async.db'}"
+    db = DatabaseManager(pool_size=1, backend=dsn)
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO books (title, author, isbn, category, quantity, available) VALUES (%s, %s, %s, %s, %s, %s)",
+            [(f"Book {i:06d}", f"Author {i % 97}", f"ISBN-{i:09d}", f"Category {i % 12}", 3, 3)
+             for i in range(1, BOOKS + 1)]
+        )
+        cursor.executemany(
+            "INSERT INTO students (name, email, phone, address) VALUES (%s, %s, %s, %s)",
+            [(f"Student {i:06d}", f"student{i}@example.com", f"{i:010d}", f"{i} Main Street")
+             for i in range(1, STUDENTS + 1)]
+        )
+        conn.commit()
+        cursor.close()
+    db.reconcile_counters(fix=True)
+    db.pool.close()
+    return dsn
+
+
+def with_managers(dsn, test, pool_size=5):
+    """Run test(adb, db) on a fresh pair of managers over the same file"""
+    async def run():
+        db = DatabaseManager(pool_size=pool_size, backend=dsn, stats_ttl=0)
+        adb = await AsyncDatabaseManager.open(pool_size=pool_size, backend=dsn, stats_ttl=0)
+        try:
+            return await test(adb, db)
+        finally:
+            await adb.close()
+            db.pool.close()
+    return asyncio.run(run())
+
+
+def test_methods_match_database_manager(dsn):
+    async def test(adb, db):
+        rng = random.Random(3)
+        books = db.get_all_books()
+        ids = [rng.randint(1, STUDENTS) for _ in range(5)]
+        # Some open and some overdue issues for the lookups below
+        for student_id in ids:
+            assert db.issue_book(rng.choice(books)['book_id'], student_id, days=rng.choice([-20, -3, 14]))[0]
+
+        checks = [
+            ('get_all_books', ()),
+            ('get_all_students', ()),
+            ('get_books_page', ()),
+            ('get_books_page', (books[len(books) // 2]['title'], books[len(books) // 2]['book_id'], 25)),
+            ('get_books_page', (None, None, 40, {'category': 'Category 3', 'available_only': True})),
+            ('get_students_page', ()),
+            ('get_students_page', ('Student 000010', 10, 30)),
+            ('get_student', (ids[0],)),
+            ('get_student', (STUDENTS + 1,)),
+            ('get_issued_books', ()),
+            ('get_issued_books', (3,)),
+            ('get_overdue_books', ()),
+            ('get_overdue_page', ()),
+            ('get_statistics', ()),
+            ('get_fine_summary', ()),
+        ]
+        checks += [('get_open_issues', (student_id,)) for student_id in ids]
+        checks += [('get_student_history', (student_id,)) for student_id in ids]
+
+        mismatches = []
+        for name, args in checks:
+            if await getattr(adb, name)(*args) != getattr(db, name)(*args):
+                mismatches.append(f"{name}{args}")
+        assert mismatches == []
+
+    with_managers(dsn, test)
+
+
+def test_issue_and_return_match_database_manager(dsn):
+    async def test(adb, db):
+        book = db.get_all_books()[0]
+        before = db.get_statistics()['issued_books']
+        assert await adb.issue_book(book['book_id'], 1, days=-5) == (True, "Book issued successfully!")
+        issue = max(db.get_student_history(1), key=lambda row: row['issue_id'])
+        assert db.get_statistics()['issued_books'] == before + 1
+        # Each manager keeps its own overdue tracker, as two processes would
+        assert issue['issue_id'] in {row['issue_id'] for row in await adb.get_overdue_books()}
+
+        fine = db.calculate_fine(issue['due_date'], date.today(), book['category'])
+        assert await adb.return_book(issue['issue_id'], damage_charge=2.5) == (
+            True, f"Book returned! Fine: ${fine:.2f}, Damage: $2.50, Total: ${fine + 2.5:.2f}")
+        assert db.get_statistics()['issued_books'] == before
+        assert await adb.return_book(issue['issue_id']) == db.return_book(issue['issue_id'])
+
+    with_managers(dsn, test)
+
+
+def test_concurrent_issues_never_oversell(dsn):
+    async def test(adb, db):
+        book_id = db.get_books_page(limit=1)[0]['book_id']
+        results = await asyncio.gather(*[adb.issue_book(book_id, 1 + n % STUDENTS) for n in range(2000)])
+        assert sum(ok for ok, _ in results) == 3
+        assert all(msg == "Book not available!" for ok, msg in results if not ok)
+        assert db.reconcile_counters(fix=False) == {}
+
+    with_managers(dsn, test)
@@ -0,0 +1,92 @@
+"""
+Connection Pool Tests
+Waiters on a full pool are woken when a slot is freed, not only when a
+connection is checked back in
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_pool import AsyncConnectionPool, ConnectionPool, PoolExhaustedError
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeAsyncConnection:
+    async def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_waiter_gets_slot_freed_by_broken_connection():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=5)
+    held = pool.checkout()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.checkout()))
+    waiter.start()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    pool.checkin(held, broken=True)
+    waiter.join(timeout=2)
+    assert got and got[0] is not held
+    assert time.monotonic() - start < 1
+    assert pool.stats['discarded'] == 1
+
+
+def test_checkout_times_out_on_full_pool():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=0.1)
+    pool.checkout()
+    with pytest.raises(PoolExhaustedError):
+        pool.checkout()
+
+
+def test_close_wakes_waiters():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=5)
+    pool.checkout()
+    errors = []
+
+    def wait():
+        try:
+            pool.checkout()
+        except PoolExhaustedError as e:
+            errors.append(e)
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    waiter.join(timeout=2)
+    assert errors
+
+
+def test_async_waiter_gets_slot_freed_by_broken_connection():
+    async def run():
+        async def connect():
+            return FakeAsyncConnection()
+        pool = AsyncConnectionPool(connect, size=1, timeout=5)
+        held = await pool.checkout()
+        waiter = asyncio.ensure_future(pool.checkout())
+        await asyncio.sleep(0.05)
+        await pool.checkin(held, broken=True)
+        conn = await asyncio.wait_for(waiter, 1)
+        assert conn is not held
+
+        with pytest.raises(PoolExhaustedError):
+            pool.timeout = 0.05
+            await pool.checkout()
+    asyncio.run(run())
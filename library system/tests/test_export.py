@@ -0,0 +1,50 @@
+"""
+Export Tests
+DatabaseManager.export_to_csv on a SQLite file
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import library_management_system
+from library_management_system import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(pool_size=1, backend=f"sqlite:///{tmp_path / 'export.db'}")
+    for n in range(5):
+        db.add_book(f"Book {n}", "Author", f"ISBN-{n}", "Fiction", 1)
+    yield db
+    db.pool.close()
+
+
+def test_export_writes_every_row(db, tmp_path):
+    target = tmp_path / 'books.csv'
+    ok, msg = db.export_to_csv('books', str(target), batch_size=2)
+    assert ok, msg
+    with open(target, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:2] == ['book_id', 'title']
+    assert [row[1] for row in rows[1:]] == [f"Book {n}" for n in range(5)]
+
+
+def test_failed_query_keeps_existing_file(db, tmp_path, monkeypatch):
+    target = tmp_path / 'books.csv'
+    target.write_text("kept")
+    monkeypatch.setitem(library_management_system.EXPORT_QUERIES, 'books', "SELECT * FROM no_such_table")
+    ok, msg = db.export_to_csv('books', str(target))
+    assert not ok and msg.startswith("Export error")
+    assert target.read_text() == "kept"
+
+
+def test_unknown_table_keeps_existing_file(db, tmp_path):
+    target = tmp_path / 'other.csv'
+    target.write_text("kept")
+    assert not db.export_to_csv('other', str(target))[0]
+    assert target.read_text() == "kept"
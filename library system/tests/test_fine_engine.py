@@ -0,0 +1,129 @@
+"""
+Fine Engine Tests
+Per-category fine policies, one loan at a time and vectorized, with and
+without numpy
+"""
+
+import os
+import random
+import re
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fine_engine
+from fine_engine import FineEngine
+from library_management_system import DatabaseManager
+
+SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'library_db.sql')
+
+TODAY = date(2024, 3, 15)
+
+POLICIES = {
+    'default': {'rate': 5},
+    'Reference': {'rate': 2, 'grace_days': 1, 'cap': 30},
+    'Children': {'rate': 0.1, 'grace_days': 3},
+}
+
+
+def late(days):
+    """Due date of a loan days late on TODAY"""
+    return TODAY - timedelta(days=days)
+
+
+@pytest.fixture
+def engine():
+    return FineEngine(POLICIES)
+
+
+def test_default_is_five_dollars_a_day():
+    engine = FineEngine()
+    assert engine.fine(late(3), TODAY) == 15
+    assert engine.fine(late(0), TODAY) == 0
+    assert engine.fine(late(-4), TODAY) == 0
+
+
+def test_grace_days(engine):
+    assert engine.fine(late(1), TODAY, 'Reference') == 0
+    assert engine.fine(late(2), TODAY, 'Reference') == 2
+    assert engine.fine(late(3), TODAY, 'Children') == 0
+    assert engine.fine(late(5), TODAY, 'Children') == 0.2
+
+
+def test_cap(engine):
+    assert engine.fine(late(16), TODAY, 'Reference') == 30
+    assert engine.fine(late(200), TODAY, 'Reference') == 30
+    assert engine.fine(late(200), TODAY, 'Children') == 19.7
+
+
+def test_unknown_category_uses_default(engine):
+    assert engine.fine(late(2), TODAY, 'Fiction') == 10
+    assert engine.fine(late(2), TODAY, None) == 10
+
+
+def test_amounts_are_whole_cents(engine):
+    # 0.1 * 3 is 0.30000000000000004 in floats
+    assert engine.fine(late(6), TODAY, 'Children') == 0.3
+    assert engine.accrue([late(6)], ['Children'], TODAY) == [0.3]
+    assert engine.summarize([late(6)] * 10, ['Children'] * 10, TODAY) == (3.0, 10)
+
+
+def test_table(engine):
+    assert engine.table() == [
+        ('default', Decimal(5), 0, None),
+        ('Reference', Decimal(2), 1, Decimal(30)),
+        ('Children', Decimal('0.1'), 3, None),
+    ]
+
+
+@pytest.mark.skipif(fine_engine.np is None, reason="numpy not installed")
+@pytest.mark.parametrize('policies', [POLICIES, {'default': {'rate': 1.25, 'grace_days': 2, 'cap': 12}}])
+def test_numpy_and_pure_python_agree(monkeypatch, policies):
+    rng = random.Random(5)
+    categories = [rng.choice(['Reference', 'Children', 'Fiction', None]) for _ in range(2000)]
+    due_dates = [late(rng.randint(-30, 400)) for _ in categories]
+
+    vectorized = FineEngine(policies)
+    expected = (vectorized.accrue(due_dates, categories, TODAY),
+                vectorized.summarize(due_dates, categories, TODAY))
+    monkeypatch.setattr(fine_engine, 'np', None)
+    pure = FineEngine(policies)
+    assert (pure.accrue(due_dates, categories, TODAY), pure.summarize(due_dates, categories, TODAY)) == expected
+    assert expected[0] == [pure.fine(due, TODAY, category) for due, category in zip(due_dates, categories)]
+
+
+def test_overdue_view_charges_like_the_engine(tmp_path):
+    """library_db.sql's overdue_books view, over the fine_policies rows the
+    application writes, agrees with FineEngine"""
+    db = DatabaseManager(pool_size=1, backend=f"sqlite:///{tmp_path / 'fines.db'}", fine_policies=POLICIES)
+    for category in ['Reference', 'Children', 'Fiction', None]:
+        db.add_book(f"Book {category}", "Author", f"ISBN-{category}", category, 10)
+    db.add_student("Student", "student@example.com", "0000000000", "Main Street")
+    for book in db.get_all_books():
+        for days in [1, 2, 4, 16, 200]:
+            assert db.issue_book(book['book_id'], 1, days=-days)[0]
+
+    with open(SCHEMA) as f:
+        view = re.search(r"CREATE OR REPLACE VIEW overdue_books AS(.*?);\n", f.read(), re.S).group(1)
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM fine_policies")
+        assert cursor.fetchall() == db.fines.table()
+        cursor.execute(f"""
+            SELECT v.calculated_fine, i.due_date, b.category
+            FROM ({view}) v
+            JOIN issues i ON i.issue_id = v.issue_id
+            JOIN books b ON b.book_id = i.book_id
+        """)
+        rows = cursor.fetchall()
+        cursor.close()
+    db.pool.close()
+
+    # SQLite has no DECIMAL arithmetic, so the view's sums come back as floats
+    today = date.today()
+    assert len(rows) == 20
+    assert [round(float(fine), 2) for fine, _, _ in rows] == [db.fines.fine(due, today, category) for _, due, category in rows]
@@ -0,0 +1,45 @@
+"""
+Import Tests
+CSV imports in DatabaseManager and the counters they leave, on a SQLite file
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_management_system import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(pool_size=1, backend=f"sqlite:///{tmp_path / 'import.db'}")
+    yield db
+    db.pool.close()
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def test_student_emails_match_regardless_of_case(db, tmp_path):
+    assert db.add_student("Existing", "Old@Example.com", "0000000000", "Main Street")[0]
+    filename = write_csv(tmp_path / 'students.csv', [
+        ['name', 'email', 'phone', 'address'],
+        ['First', 'A@Example.com', '1111111111', ''],
+        ['Second', ' a@example.com', '2222222222', ''],
+        ['Renamed', 'OLD@example.COM', '3333333333', ''],
+    ])
+
+    ok, msg = db.import_students_csv(filename, batch_size=10)
+    assert ok and "(1 new, 1 updated, 0 skipped)" in msg
+    students = {s['email']: s['name'] for s in db.get_all_students()}
+    assert students == {'a@example.com': 'Second', 'old@example.com': 'Renamed'}
+    assert db.get_statistics()['total_students'] == 2
+    assert db.reconcile_counters(fix=False) == {}
+    assert db.verify_login("A@EXAMPLE.com", '', 'student')[0]
@@ -0,0 +1,47 @@
+"""
+Issue Tests
+Multi-book issues in DatabaseManager.issue_books, on a SQLite file
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_management_system import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(pool_size=1, backend=f"sqlite:///{tmp_path / 'issues.db'}")
+    db.add_book("Book A", "Author", "ISBN-A", "Fiction", 3)
+    db.add_book("Book B", "Author", "ISBN-B", "Fiction", 3)
+    db.add_student("Student", "student@example.com", "0000000000", "Main Street")
+    yield db
+    db.pool.close()
+
+
+def test_issue_books_tracks_only_new_issues(db, monkeypatch):
+    books = {book['title']: book['book_id'] for book in db.get_all_books()}
+    student_id = db.get_all_students()[0]['student_id']
+    # Load the tracker, then give the student an earlier issue on the same day
+    db.get_overdue_books()
+    assert db.issue_book(books["Book A"], student_id)[0]
+    earlier = {row['issue_id'] for row in db.get_open_issues(student_id)}
+
+    added = []
+    track = db.overdue.add
+
+    def add(issue_id, due_date):
+        added.append(issue_id)
+        track(issue_id, due_date)
+
+    monkeypatch.setattr(db.overdue, 'add', add)
+    ok, msg = db.issue_books(student_id, [books["Book A"], books["Book B"], books["Book B"]])
+    assert ok, msg
+
+    new = {row['issue_id'] for row in db.get_open_issues(student_id)} - earlier
+    assert len(new) == 3
+    assert sorted(added) == sorted(new)
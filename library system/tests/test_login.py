@@ -0,0 +1,68 @@
+"""
+Login Tests
+Failed-login caching in DatabaseManager.verify_login, on a SQLite file
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credentials import LoginThrottled, hash_password
+from library_management_system import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(pool_size=1, backend=f"sqlite:///{tmp_path / 'login.db'}", bcrypt_rounds=4)
+    yield db
+    db.pool.close()
+
+
+def set_password(db, username, password):
+    """Write a librarian's password directly, as another process would"""
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE librarians SET password = %s WHERE username = %s",
+                       (hash_password(password, 4), username))
+        conn.commit()
+
+
+def test_student_registered_after_failed_login(db):
+    assert db.verify_login("bob@x.com", "", "student") == (False, None)
+    assert db.verify_login("bob@x.com", "", "student") == (False, None)
+
+    ok, _ = db.add_student("Bob", "bob@x.com", "555", "")
+    assert ok
+    success, user = db.verify_login("bob@x.com", "", "student")
+    assert success and user['name'] == "Bob"
+
+
+def test_student_imported_after_lockout(db, tmp_path):
+    for _ in range(db.logins.max_failures):
+        db.verify_login("ann@x.com", "", "student")
+    with pytest.raises(LoginThrottled):
+        db.verify_login("ann@x.com", "", "student")
+
+    path = tmp_path / 'students.csv'
+    path.write_text("name,email,phone\nAnn,ann@x.com,555\n")
+    db.import_students_csv(str(path))
+    assert db.verify_login("ann@x.com", "", "student")[0]
+
+
+def test_password_set_to_a_value_that_recently_failed(db):
+    assert db.verify_login("admin", "new-secret", "librarian") == (False, None)
+    assert db.verify_login("admin", "new-secret", "librarian") == (False, None)
+    assert db.logins.stats['cached'] == 1
+
+    set_password(db, "admin", "new-secret")
+    assert db.verify_login("admin", "new-secret", "librarian")[0]
+
+
+def test_unknown_librarian_is_not_cached(db):
+    assert db.verify_login("carol", "pw", "librarian") == (False, None)
+    assert db.verify_login("carol", "pw", "librarian") == (False, None)
+    assert db.logins.stats['cached'] == 0
+    assert db.logins.stats['failed'] == 2
@@ -0,0 +1,135 @@
+"""
+Overdue Tracker Tests
+OverdueTracker on a fixed "today", and DatabaseManager's overdue pages
+built on it
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_management_system import DatabaseManager
+from overdue_tracker import OverdueTracker
+
+TODAY = date(2024, 3, 15)
+
+
+def day(offset):
+    return TODAY + timedelta(days=offset)
+
+
+@pytest.fixture
+def tracker():
+    tracker = OverdueTracker()
+    tracker.begin_reload()
+    tracker.load([(1, day(-10)), (2, day(-3)), (3, day(0)), (4, day(1)), (5, day(-3))])
+    return tracker
+
+
+def test_most_overdue_first(tracker):
+    assert tracker.overdue(TODAY) == [(day(-10), 1), (day(-3), 2), (day(-3), 5)]
+    assert tracker.overdue_count(TODAY) == 3
+    assert len(tracker) == 5
+
+
+def test_due_today_becomes_overdue_tomorrow(tracker):
+    assert (day(0), 3) not in tracker.overdue(TODAY)
+    assert tracker.overdue(day(1))[-1] == (day(0), 3)
+    assert tracker.overdue_count(day(2)) == 5
+
+
+def test_add(tracker):
+    tracker.overdue(TODAY)
+    tracker.add(6, day(-20))
+    tracker.add(7, day(5))
+    assert tracker.overdue(TODAY)[0] == (day(-20), 6)
+    assert tracker.overdue_count(TODAY) == 4
+    assert tracker.overdue(day(6))[-1] == (day(5), 7)
+
+
+def test_remove(tracker):
+    tracker.overdue(TODAY)
+    tracker.remove(1)
+    tracker.remove(4)
+    assert tracker.overdue(TODAY) == [(day(-3), 2), (day(-3), 5)]
+    # The returned issue's heap entry is skipped when its date comes round
+    assert tracker.overdue(day(2)) == [(day(-3), 2), (day(-3), 5), (day(0), 3)]
+    assert len(tracker) == 3
+
+
+def test_new_due_date_replaces_the_old_one(tracker):
+    tracker.add(4, day(10))
+    assert (day(1), 4) not in tracker.overdue(day(5))
+    assert tracker.overdue(day(11))[-1] == (day(10), 4)
+
+
+def test_changes_before_first_load_are_ignored():
+    tracker = OverdueTracker()
+    tracker.add(1, day(-1))
+    assert tracker.is_stale(300)
+    tracker.begin_reload()
+    tracker.load([])
+    assert tracker.overdue(TODAY) == []
+    assert not tracker.is_stale(300)
+    assert tracker.is_stale(0)
+
+
+def test_reload_replays_changes_made_while_reading(tracker):
+    tracker.begin_reload()
+    # Made at this desk after the reload's query read the table
+    snapshot = [(1, day(-10)), (2, day(-3)), (4, day(1))]
+    tracker.add(8, day(-1))
+    tracker.remove(2)
+    tracker.load(snapshot)
+    assert tracker.overdue(TODAY) == [(day(-10), 1), (day(-1), 8)]
+    assert len(tracker) == 3
+
+    # A later reload only replays changes made after it began
+    tracker.begin_reload()
+    tracker.load(snapshot)
+    assert tracker.overdue(TODAY) == [(day(-10), 1), (day(-3), 2)]
+
+
+def test_pages_follow_the_keyset(tracker):
+    tracker.add(9, day(-3))
+    pages = []
+    page = tracker.page(TODAY, limit=2)
+    while page:
+        pages.append(page)
+        page = tracker.page(TODAY, *page[-1], limit=2)
+    assert pages == [[(day(-10), 1), (day(-3), 2)], [(day(-3), 5), (day(-3), 9)]]
+
+
+def test_database_overdue_pages(tmp_path):
+    dsn = f"sqlite:///{tmp_path / 'overdue.db'}"
+    db = DatabaseManager(pool_size=1, backend=dsn, fine_policies={'default': {'rate': 1}})
+    db.add_book("Book", "Author", "ISBN-1", "Fiction", 20)
+    db.add_student("Student", "student@example.com", "0000000000", "Main Street")
+    for days in [-4, -1, 3, -9, -1, -2, 0]:
+        assert db.issue_book(1, 1, days=days)[0]
+
+    rows = db.get_overdue_books()
+    assert [row['days_overdue'] for row in rows] == [9, 4, 2, 1, 1]
+    assert [row['fine'] for row in rows] == [9, 4, 2, 1, 1]
+    assert db.get_statistics()['overdue_books'] == 5
+
+    pages = []
+    page = db.get_overdue_page(limit=2)
+    while page:
+        pages.append([row['issue_id'] for row in page])
+        page = db.get_overdue_page(page[-1]['due_date'], page[-1]['issue_id'], limit=2)
+    assert sum(pages, []) == [row['issue_id'] for row in rows]
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+    # Returned at another desk: dropped from the listing before the next reload
+    other = DatabaseManager(pool_size=1, backend=dsn)
+    assert other.return_book(rows[0]['issue_id'])[0]
+    other.pool.close()
+    assert [row['issue_id'] for row in db.get_overdue_page(limit=10)] == [row['issue_id'] for row in rows[1:]]
+    db.refresh_overdue(force=True)
+    assert db.overdue.overdue_count(date.today()) == 4
+    db.pool.close()
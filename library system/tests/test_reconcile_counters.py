@@ -0,0 +1,44 @@
+"""
+Counter Reconciliation Tests
+reconcile_counters.py against a SQLite file whose counters row is missing
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_management_system import DatabaseManager
+from reconcile_counters import reconcile_counters
+
+
+def counters(db):
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT total_books, total_copies, total_students FROM library_counters")
+        rows = cursor.fetchall()
+        cursor.close()
+    return rows
+
+
+def test_dry_run_reports_a_missing_row_without_seeding_it(tmp_path, capsys):
+    dsn = f"sqlite:///{tmp_path / 'counters.db'}"
+    db = DatabaseManager(pool_size=1, backend=dsn)
+    db.add_book("Book", "Author", "ISBN-1", "Fiction", 4)
+    db.add_student("Student", "student@example.com", "0000000000", "Main Street")
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM library_counters")
+        conn.commit()
+        cursor.close()
+
+    assert reconcile_counters(dry_run=True, dsn=dsn)
+    output = capsys.readouterr().out
+    assert "total_books" in output and "Dry run - counters were not changed" in output
+    assert counters(db) == []
+
+    assert reconcile_counters(dsn=dsn)
+    assert counters(db) == [(1, 4, 1)]
+    assert reconcile_counters(dry_run=True, dsn=dsn)
+    assert "no drift found" in capsys.readouterr().out
+    db.pool.close()
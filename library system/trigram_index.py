@@ -0,0 +1,163 @@
+"""
+Trigram Index
+In-memory inverted index of character trigrams over book titles and
+authors, for typo-tolerant lookup that SQL LIKE cannot serve from an index
+"""
+
+import heapq
+import re
+import sys
+import threading
+from array import array
+from collections import Counter
+from operator import itemgetter
+
+
+def words_of(text):
+    """Lower-cased words in text"""
+    return re.findall(r"\w+", text.lower())
+
+
+def trigrams(word):
+    """Set of padded character trigrams of a single word"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(grams_a, grams_b):
+    """Dice coefficient of two trigram sets"""
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class TrigramIndex:
+    """Fuzzy, ranked lookup of books by title and author
+
+    Trigrams index the distinct words of the catalogue rather than the
+    books, so matching a misspelt word only scans the vocabulary. Each
+    word maps to a compact array of the books containing it, and the
+    candidates are re-ranked by how closely they match every query word.
+    """
+
+    def __init__(self, expansion_budget=50000):
+        # After the rarest query word, only expand words matching fewer books
+        self.expansion_budget = expansion_budget
+        self._word_ids = {}
+        self._word_sizes = []
+        self._word_books = []
+        self._gram_words = {}
+        self._books = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._books)
+
+    def _word_id(self, word):
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            word_id = self._word_ids[word] = len(self._word_sizes)
+            grams = trigrams(word)
+            self._word_sizes.append(len(grams))
+            self._word_books.append(array('I'))
+            for gram in grams:
+                posting = self._gram_words.get(gram)
+                if posting is None:
+                    posting = self._gram_words[gram] = array('I')
+                posting.append(word_id)
+        return word_id
+
+    def add(self, book_id, title, author):
+        """Index a book, replacing any previous entry for it"""
+        with self._lock:
+            if book_id in self._books:
+                self.remove(book_id)
+            self._books[book_id] = (title, author)
+            for word in set(words_of(f"{title} {author}")):
+                self._word_books[self._word_id(word)].append(book_id)
+
+    def remove(self, book_id):
+        """Drop a book from the index"""
+        with self._lock:
+            title, author = self._books.pop(book_id)
+            for word in set(words_of(f"{title} {author}")):
+                books = self._word_books[self._word_ids[word]]
+                if book_id in books:
+                    books.remove(book_id)
+
+    @classmethod
+    def from_books(cls, books, **kwargs):
+        """Build an index from book rows as returned by get_all_books"""
+        index = cls(**kwargs)
+        for book in books:
+            index.add(book['book_id'], book['title'], book['author'])
+        return index
+
+    def similar_words(self, word, limit=16, min_score=0.3):
+        """Vocabulary words spelt like word, as [(word_id, score)] best first"""
+        grams = trigrams(word)
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._gram_words.get(gram, ()))
+        similar = []
+        for word_id, shared in hits.most_common(limit * 4):
+            score = 2 * shared / (len(grams) + self._word_sizes[word_id])
+            if score >= min_score:
+                similar.append((word_id, score))
+        similar.sort(key=itemgetter(1), reverse=True)
+        return similar[:limit]
+
+    def search(self, query, limit=10, min_score=0.3):
+        """Return [(book_id, score)] best first, score in 0..1"""
+        query_words = list(dict.fromkeys(words_of(query)))
+        if not query_words:
+            return []
+
+        with self._lock:
+            expansions = []
+            for word in query_words:
+                similar = self.similar_words(word, min_score=min_score)
+                size = sum(len(self._word_books[word_id]) for word_id, _ in similar)
+                expansions.append((size, similar))
+            expansions.sort(key=itemgetter(0))
+
+            # Credit each book with its closest word per query word
+            partial = Counter()
+            for n, (size, similar) in enumerate(expansions):
+                if n and size > self.expansion_budget:
+                    break
+                closest = {}
+                for word_id, score in reversed(similar):
+                    closest.update(dict.fromkeys(self._word_books[word_id], score))
+                partial.update(closest)
+
+            candidates = [
+                (book_id, self._books[book_id])
+                for book_id, _ in heapq.nlargest(limit * 5, partial.items(), key=itemgetter(1))
+            ]
+
+        # Re-rank the candidates against every query word
+        query_grams = [trigrams(word) for word in query_words]
+        results = []
+        for book_id, (title, author) in candidates:
+            book_grams = [trigrams(word) for word in set(words_of(f"{title} {author}"))]
+            score = sum(
+                max(similarity(grams, other) for other in book_grams)
+                for grams in query_grams
+            ) / len(query_grams)
+            if score >= min_score:
+                results.append((book_id, round(score, 4)))
+
+        results.sort(key=itemgetter(1), reverse=True)
+        return results[:limit]
+
+    def memory_usage(self):
+        """Approximate bytes held by the index"""
+        total = sum(sys.getsizeof(part) for part in (
+            self._word_ids, self._word_sizes, self._word_books, self._gram_words, self._books
+        ))
+        total += sum(sys.getsizeof(word) for word in self._word_ids)
+        total += sum(sys.getsizeof(books) for books in self._word_books)
+        for gram, words in self._gram_words.items():
+            total += sys.getsizeof(gram) + sys.getsizeof(words)
+        for title, author in self._books.values():
+            total += sys.getsizeof(title) + sys.getsizeof(author) + 56
+        return total